@@ -35,19 +35,61 @@ ALLOWED_HOSTS = [
 # Database configuration
 import dj_database_url
 
+# We serve through ASGI (Procfile, render.yaml, railway.json), where each
+# request's sync code runs on its own thread, so persistent connections are
+# never reused - they just pile up, one per open badge stream. Close them at
+# the end of each request unless a pooler sits in front of the database.
+CONN_MAX_AGE = int(os.environ.get('CONN_MAX_AGE', '0'))
+
 DATABASES = {
     'default': dj_database_url.config(
         default='sqlite:///db.sqlite3',
-        conn_max_age=600,
-        conn_health_checks=True,
+        conn_max_age=CONN_MAX_AGE,
+        conn_health_checks=CONN_MAX_AGE > 0,
     )
 }
 
 # If on Render, ensure we use PostgreSQL
 if 'RENDER' in os.environ:
     DATABASES['default'] = dj_database_url.config(
-        conn_max_age=600,
-        conn_health_checks=True,
+        conn_max_age=CONN_MAX_AGE,
+        conn_health_checks=CONN_MAX_AGE > 0,
+    )
+
+# Block lists, search results, badge versions and (via cached_db) sessions.
+# In-process by default, which is fine while one web process does all the
+# writing. Set REDIS_URL to share it between processes: badge version bumps
+# made by `manage.py run_worker` or cron commands are otherwise invisible to
+# the web process's /badges/ ETag and badge stream.
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'gr8date',
+        }
+    }
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Background jobs (pages/jobs.py) run on a thread inside the web process.
+# Set to False when a separate `manage.py run_worker` process runs them;
+# that needs the shared cache above.
+JOBS_IN_PROCESS = os.environ.get('JOBS_IN_PROCESS', 'true').lower() == 'true'
+
+if not JOBS_IN_PROCESS and not REDIS_URL:
+    from django.core.exceptions import ImproperlyConfigured
+    raise ImproperlyConfigured(
+        'JOBS_IN_PROCESS=false needs REDIS_URL: jobs run by the worker bump badge '
+        'versions that the web process must be able to see.'
     )
 
 INSTALLED_APPS = [
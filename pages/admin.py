@@ -5,8 +5,9 @@ from django.contrib.auth.models import User
 from django.contrib.auth.admin import UserAdmin
 from .models import (
     Profile, Message, Thread, Like, Block, PrivateAccessRequest,
-    HotDate, HotDateView, HotDateNotification, Blog, UserActivity, ProfileImage
+    HotDate, HotDateView, HotDateNotification, Blog, UserActivity, ProfileImage, Job
 )
+from .badges import recount_badge_counters
 
 # Inline admin for Profile
 class ProfileInline(admin.StackedInline):
@@ -46,15 +47,25 @@ class ProfileImageAdmin(admin.ModelAdmin):
 @admin.register(Message)
 class MessageAdmin(admin.ModelAdmin):
     list_display = ('thread', 'sender', 'recipient', 'created_at', 'is_read')
-    list_filter = ('is_read', 'created_at')
+    list_filter = ('created_at',)
+    list_select_related = ('thread', 'sender', 'recipient')
     search_fields = ('text', 'sender__username', 'recipient__username')
     readonly_fields = ('created_at',)
 
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'status', 'attempts', 'run_at', 'created_at')
+    list_filter = ('status', 'task')
+    readonly_fields = ('created_at', 'started_at', 'last_error')
+
 @admin.register(Thread)
 class ThreadAdmin(admin.ModelAdmin):
-    list_display = ('user_a', 'user_b', 'created_at', 'updated_at')
+    list_display = ('user_a', 'user_b', 'created_at', 'updated_at', 'unread_count_a', 'unread_count_b')
     search_fields = ('user_a__username', 'user_b__username')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = (
+        'created_at', 'updated_at', 'last_message', 'last_message_text', 'last_message_at', 'last_sender',
+        'unread_count_a', 'unread_count_b', 'last_read_a', 'last_read_b',
+    )
 
 @admin.register(Like)
 class LikeAdmin(admin.ModelAdmin):
@@ -126,11 +137,15 @@ class HotDateNotificationAdmin(admin.ModelAdmin):
 
     def mark_as_read(self, request, queryset):
         from django.utils import timezone
+        user_ids = set(queryset.values_list('user_id', flat=True))
         queryset.update(is_read=True, read_at=timezone.now())
+        recount_badge_counters(*user_ids)
     mark_as_read.short_description = "Mark selected notifications as read"
 
     def mark_as_unread(self, request, queryset):
+        user_ids = set(queryset.values_list('user_id', flat=True))
         queryset.update(is_read=False, read_at=None)
+        recount_badge_counters(*user_ids)
     mark_as_unread.short_description = "Mark selected notifications as unread"
 
 # FIXED BlogAdmin - Blog model doesn't have 'user' field, it's a standalone model
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PagesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pages'
+
+    def ready(self):
+        from . import badges  # noqa: F401 - connects the badge receivers
+        from . import tasks  # noqa: F401 - registers the background job tasks
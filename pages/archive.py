@@ -0,0 +1,150 @@
+# pages/archive.py
+"""
+Cold storage for old messages.
+
+archive_thread() moves a thread's messages older than a horizon out of the
+hot pages_message table into compressed MessageArchive chunks. The newest
+message of a thread is never archived (the thread summary points at it).
+
+message_page() is what the thread views read: the hot table first, then the
+archive once the hot rows run out, behind the same (created_at, id) cursors
+as pages.pagination - so clients scroll back through both without knowing.
+"""
+from __future__ import annotations
+
+import json
+import zlib
+from datetime import datetime
+
+from django.db import transaction
+
+from .models import Message, MessageArchive, Thread
+from .pagination import CursorPage, decode_cursor, encode_cursor, paginate_by_cursor
+
+# Messages per MessageArchive row.
+ARCHIVE_CHUNK_SIZE = 500
+
+
+class ArchivedMessage:
+    """Read-only stand-in for a Message restored from the archive."""
+
+    __slots__ = (
+        "id", "thread", "sender_id", "recipient_id", "text", "created_at",
+        "is_deleted_by_sender", "is_deleted_by_recipient",
+    )
+
+    def __init__(self, thread, data: dict):
+        self.thread = thread
+        self.id = data["id"]
+        self.sender_id = data["sender_id"]
+        self.recipient_id = data["recipient_id"]
+        self.text = data["text"]
+        self.created_at = datetime.fromisoformat(data["created_at"])
+        self.is_deleted_by_sender = data["deleted_by_sender"]
+        self.is_deleted_by_recipient = data["deleted_by_recipient"]
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def is_read(self) -> bool:
+        return self.id <= self.thread.read_cursor_for(self.recipient_id)
+
+    def is_visible_to(self, user) -> bool:
+        """Python twin of MessageQuerySet.visible_to()."""
+        if self.id <= self.thread.cleared_cursor_for(user.id):
+            return False
+        if self.sender_id == user.id:
+            return not self.is_deleted_by_sender
+        return self.recipient_id == user.id and not self.is_deleted_by_recipient
+
+
+def _pack(messages) -> bytes:
+    rows = [
+        {
+            "id": m.id,
+            "sender_id": m.sender_id,
+            "recipient_id": m.recipient_id,
+            "text": m.text,
+            "created_at": m.created_at.isoformat(),
+            "deleted_by_sender": m.is_deleted_by_sender,
+            "deleted_by_recipient": m.is_deleted_by_recipient,
+        }
+        for m in messages
+    ]
+    return zlib.compress(json.dumps(rows, separators=(",", ":")).encode())
+
+
+def _unpack(archive: MessageArchive) -> list[dict]:
+    return json.loads(zlib.decompress(bytes(archive.payload)))
+
+
+def archive_thread(thread: Thread, before: datetime) -> int:
+    """Archive ``thread``'s messages created before ``before``; returns how many."""
+    with transaction.atomic():
+        old = Message.objects.filter(thread=thread, created_at__lt=before)
+        if thread.last_message_id is not None:
+            old = old.exclude(pk=thread.last_message_id)
+        messages = list(old.order_by("id").select_for_update())
+        if not messages:
+            return 0
+        MessageArchive.objects.bulk_create([
+            MessageArchive(
+                thread=thread,
+                first_message_id=chunk[0].id,
+                last_message_id=chunk[-1].id,
+                first_created_at=chunk[0].created_at,
+                last_created_at=chunk[-1].created_at,
+                message_count=len(chunk),
+                payload=_pack(chunk),
+            )
+            for chunk in (
+                messages[i:i + ARCHIVE_CHUNK_SIZE] for i in range(0, len(messages), ARCHIVE_CHUNK_SIZE)
+            )
+        ])
+        Message.objects.filter(pk__in=[m.id for m in messages]).delete()
+    return len(messages)
+
+
+def archived_messages(thread: Thread, user, before_id: int, limit: int) -> list[ArchivedMessage]:
+    """Up to ``limit`` archived messages visible to ``user`` older than ``before_id``, newest first."""
+    found = []
+    chunks = MessageArchive.objects.filter(thread=thread, first_message_id__lt=before_id)
+    for archive in chunks.order_by("-last_message_id").iterator():
+        for data in reversed(_unpack(archive)):
+            if data["id"] >= before_id:
+                continue
+            message = ArchivedMessage(thread, data)
+            if message.is_visible_to(user):
+                found.append(message)
+                if len(found) == limit:
+                    return found
+    return found
+
+
+def message_page(thread: Thread, user, after: str | None = None, per_page: int = 30) -> CursorPage:
+    """
+    Newest-first page of ``thread`` as ``user`` sees it, continuing into the
+    archive when the hot table runs out. ``after`` is a cursor from a
+    previous page's ``next_cursor``.
+    """
+    page = paginate_by_cursor(thread.messages.visible_to(user), after=after, per_page=per_page)
+    if page.has_next:
+        return page
+
+    rows = list(page.object_list)
+    if rows:
+        before_id = rows[-1].id
+    else:
+        cursor = decode_cursor(after)
+        before_id = cursor[1] if cursor else (thread.last_message_id or 0) + 1
+
+    # Fetch one extra to know whether another page follows
+    older = archived_messages(thread, user, before_id, per_page - len(rows) + 1)
+    more = len(older) > per_page - len(rows)
+    rows += older[: per_page - len(rows)]
+    if more and rows:
+        page.next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    page.object_list = rows
+    return page
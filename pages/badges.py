@@ -0,0 +1,205 @@
+# pages/badges.py
+"""
+Header badge counts (unread messages, new Hot Dates) and change tracking.
+
+Unread messages and unread Hot Date notifications live in a per-user
+BadgeCounter row, adjusted by signal receivers on create/delete and by
+adjust_badge_counters() where things are marked read. The message count is
+the sum of the per-thread unread counters. A missing row is rebuilt
+from the source tables on first use. New Hot Dates are those created since
+the row's ``hotdates_seen_at`` watermark, moved by mark_hotdates_seen() when
+the user opens the Hot Dates list.
+
+Every write that can move a badge also bumps a version key in the cache - per
+user, plus one shared key for Hot Date listings. Processes other than the web
+server (run_worker, cron commands) only reach the web server's versions when
+the cache is shared (REDIS_URL, see core/settings.py). The badge stream and the
+/badges/ ETag compare versions (a cache read, no SQL) and only recount when
+something actually changed. Receivers are connected from PagesConfig.ready();
+code that writes with QuerySet.update() or bulk_create() bypasses signals and
+must call adjust_badge_counters() / bump_badges() itself.
+"""
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Max, Q, Sum
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import BadgeCounter, HotDate, HotDateNotification, HotDateView, Message, Thread
+
+# Hot Dates younger than this count as "new" on the badge.
+NEW_HOTDATE_WINDOW = timedelta(hours=24)
+
+# "New" Hot Dates age out without any write, so versions also roll over
+# on this period.
+VERSION_PERIOD_SECONDS = 300
+
+_HOTDATES_KEY = "pages:badges:hotdates"
+
+
+def _user_key(user_id: int) -> str:
+    return f"pages:badges:user:{user_id}"
+
+
+def _recount(user_id: int) -> dict[str, int]:
+    threads = Thread.objects.filter(Q(user_a_id=user_id) | Q(user_b_id=user_id)).aggregate(
+        as_a=Sum('unread_count_a', filter=Q(user_a_id=user_id)),
+        as_b=Sum('unread_count_b', filter=Q(user_b_id=user_id)),
+    )
+    return {
+        'unread_messages': (threads['as_a'] or 0) + (threads['as_b'] or 0),
+        'unread_hotdate_notifications': HotDateNotification.objects.filter(user_id=user_id, is_read=False).count(),
+    }
+
+
+def badge_counter(user) -> BadgeCounter:
+    """The user's counter row, rebuilt from the source tables if missing."""
+    try:
+        return BadgeCounter.objects.get(user_id=user.pk)
+    except BadgeCounter.DoesNotExist:
+        # No watermark yet: start it at the user's latest Hot Date view, so
+        # dates they already marked seen don't show up as new again
+        seen_at = HotDateView.objects.filter(user_id=user.pk).aggregate(latest=Max('viewed_at'))['latest']
+        counter, _ = BadgeCounter.objects.get_or_create(
+            user_id=user.pk, defaults={**_recount(user.pk), 'hotdates_seen_at': seen_at}
+        )
+        return counter
+
+
+def recount_badge_counters(*user_ids: int) -> None:
+    """Rebuild counters from scratch, e.g. after bulk admin edits."""
+    for user_id in user_ids:
+        BadgeCounter.objects.update_or_create(user_id=user_id, defaults=_recount(user_id))
+    bump_badges(*user_ids)
+
+
+def adjust_badge_counters(user_id: int, **deltas: int) -> None:
+    """Add ``deltas`` (field=+n/-n) to a user's counters in one UPDATE."""
+    adjust_many_badge_counters([user_id], **deltas)
+
+
+def adjust_many_badge_counters(user_ids, **deltas: int) -> None:
+    """Add the same ``deltas`` to the counters of every user in ``user_ids``."""
+    user_ids = list(user_ids)
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas or not user_ids:
+        return
+    # No row yet is fine: badge_counter() builds it from current data later
+    BadgeCounter.objects.filter(user_id__in=user_ids).update(
+        **{field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()}
+    )
+    bump_badges(*user_ids)
+
+
+def discount_thread_unread(thread) -> None:
+    """Take ``thread``'s unread messages off both participants' badges."""
+    adjust_badge_counters(thread.user_a_id, unread_messages=-thread.unread_count_a)
+    adjust_badge_counters(thread.user_b_id, unread_messages=-thread.unread_count_b)
+
+
+def unread_message_count(user) -> int:
+    return badge_counter(user).unread_messages
+
+
+def new_hotdates_count(user, counter: BadgeCounter | None = None) -> int:
+    """Hot Dates created since the user last opened the list plus unread notifications."""
+    counter = counter or badge_counter(user)
+    since = timezone.now() - NEW_HOTDATE_WINDOW
+    if counter.hotdates_seen_at and counter.hotdates_seen_at > since:
+        since = counter.hotdates_seen_at
+    new_hotdates = HotDate.objects.filter(
+        created_at__gt=since,
+        is_active=True,
+        is_cancelled=False
+    ).count()
+    return new_hotdates + counter.unread_hotdate_notifications
+
+
+def mark_hotdates_seen(user) -> None:
+    """Move the user's Hot Dates watermark to now, clearing the "new" part of the badge."""
+    now = timezone.now()
+    if not BadgeCounter.objects.filter(user_id=user.pk).update(hotdates_seen_at=now):
+        BadgeCounter.objects.get_or_create(user_id=user.pk, defaults={**_recount(user.pk), 'hotdates_seen_at': now})
+    bump_badges(user.pk)
+
+
+def badge_counts(user) -> dict[str, int]:
+    counter = badge_counter(user)
+    return {
+        'messages': counter.unread_messages,
+        'hotdates': new_hotdates_count(user, counter),
+    }
+
+
+def _stamp() -> int:
+    return time.time_ns()
+
+
+def bump_badges(*user_ids: int) -> None:
+    """
+    Mark the badges of ``user_ids`` as changed once the current transaction
+    commits, so a reader never pairs the new version with old counts.
+    """
+    user_ids = list(user_ids)
+    transaction.on_commit(
+        lambda: cache.set_many({_user_key(user_id): _stamp() for user_id in user_ids}, None)
+    )
+
+
+def bump_hotdate_badges() -> None:
+    """Mark every user's Hot Dates badge as changed (on commit, as above)."""
+    transaction.on_commit(lambda: cache.set(_HOTDATES_KEY, _stamp(), None))
+
+
+def _version(versions: dict, user_id: int) -> tuple:
+    period = int(time.time() // VERSION_PERIOD_SECONDS)
+    return (versions.get(_user_key(user_id)), versions.get(_HOTDATES_KEY), period)
+
+
+def badge_version(user_id: int) -> tuple:
+    """Opaque value that changes whenever ``user_id``'s badges may have."""
+    return _version(cache.get_many([_user_key(user_id), _HOTDATES_KEY]), user_id)
+
+
+async def abadge_version(user_id: int) -> tuple:
+    return _version(await cache.aget_many([_user_key(user_id), _HOTDATES_KEY]), user_id)
+
+
+@receiver(post_save, sender=Message)
+def _message_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust_badge_counters(instance.recipient_id, unread_messages=1)
+    else:
+        bump_badges(instance.recipient_id)
+
+
+@receiver(post_delete, sender=Thread)
+def _thread_deleted(sender, instance, **kwargs):
+    discount_thread_unread(instance)
+
+
+@receiver(post_save, sender=HotDateNotification)
+def _notification_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and not instance.is_read:
+        adjust_badge_counters(instance.user_id, unread_hotdate_notifications=1)
+    else:
+        bump_badges(instance.user_id)
+
+
+@receiver(post_delete, sender=HotDateNotification)
+def _notification_deleted(sender, instance, **kwargs):
+    if not instance.is_read:
+        adjust_badge_counters(instance.user_id, unread_hotdate_notifications=-1)
+
+
+@receiver([post_save, post_delete], sender=HotDate)
+def _hotdate_changed(sender, instance, **kwargs):
+    bump_hotdate_badges()
+
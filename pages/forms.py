@@ -1,9 +1,13 @@
 # pages/forms.py
+import re
+
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 from allauth.account.forms import LoginForm  # NEW IMPORT
 
+from .models import Profile
+
 class CustomLoginForm(LoginForm):  # NEW CLASS
     """Custom login form for Allauth"""
     pass
@@ -19,3 +23,62 @@ class ContactForm(forms.Form):
     name = forms.CharField(max_length=100)
     email = forms.EmailField()
     message = forms.CharField(widget=forms.Textarea)
+
+class ProfileSearchForm(forms.Form):
+    """Typed profile-search filters (GET /search/ and /api/search/)."""
+    AGE_RANGE_RE = re.compile(r'^\s*(\d+)\s*-\s*(\d+)\s*$')
+    FILTER_FIELDS = ('q', 'min_age', 'max_age', 'gender', 'location', 'intent', 'distance', 'interests')
+
+    q = forms.CharField(max_length=200, required=False)
+    min_age = forms.IntegerField(min_value=18, max_value=99, required=False)
+    max_age = forms.IntegerField(min_value=18, max_value=99, required=False)
+    gender = forms.ChoiceField(choices=[('', 'Any')] + Profile.Gender.choices, required=False)
+    location = forms.CharField(max_length=120, required=False)
+    intent = forms.ChoiceField(choices=[('', 'Any')] + Profile.Intent.choices, required=False)
+    distance = forms.ChoiceField(choices=[('', 'Any')] + Profile.Distance.choices, required=False)
+    interests = forms.CharField(max_length=600, required=False)
+
+    def clean(self):
+        data = super().clean()
+        q = (data.get('q') or '').strip()
+        
+        # The search box still accepts "30-40" or "35" as an age search
+        age_range = self.AGE_RANGE_RE.match(q)
+        if age_range:
+            ages = int(age_range.group(1)), int(age_range.group(2))
+        elif q.isdigit():
+            ages = int(q), int(q)
+        else:
+            ages = None
+        if ages:
+            field = self.fields['min_age']
+            if all(field.min_value <= age <= field.max_value for age in ages):
+                data['min_age'], data['max_age'] = ages
+            else:
+                self.add_error('q', f"Ages must be between {field.min_value} and {field.max_value}.")
+            q = ''
+        data['q'] = q
+        
+        if data.get('min_age') and data.get('max_age') and data['min_age'] > data['max_age']:
+            data['min_age'], data['max_age'] = data['max_age'], data['min_age']
+        return data
+
+    @property
+    def filters(self):
+        """Cleaned filters with the empty ones dropped."""
+        return {
+            name: self.cleaned_data[name]
+            for name in self.FILTER_FIELDS
+            if self.cleaned_data.get(name) not in (None, '')
+        }
+
+    def summary(self):
+        """Human-readable description of the active filters."""
+        filters = self.filters
+        parts = []
+        if 'q' in filters:
+            parts.append(filters['q'])
+        if 'min_age' in filters or 'max_age' in filters:
+            parts.append(f"ages {filters.get('min_age', 18)}-{filters.get('max_age', 99)}")
+        parts += [str(filters[name]) for name in ('gender', 'location', 'intent', 'distance', 'interests') if name in filters]
+        return ', '.join(parts)
@@ -0,0 +1,149 @@
+# pages/jobs.py
+"""
+A small database-backed job queue for side effects that shouldn't hold up a
+request: system messages, notification fan-out, activity logs.
+
+``enqueue(name, payload)`` inserts a Job row - inside the caller's
+transaction, so a rolled-back request enqueues nothing. Jobs are run by
+``run_pending()``, called from:
+
+* an in-process daemon thread, woken when an enqueueing transaction commits
+  (on by default, ``JOBS_IN_PROCESS = False`` turns it off), and/or
+* ``manage.py run_worker`` in a separate process.
+
+Both claim jobs with a conditional UPDATE, so they can run side by side.
+Failed jobs are retried with backoff up to JOB_MAX_ATTEMPTS, then kept with
+status "failed" and the last traceback. Tasks register with ``@task`` in
+pages/tasks.py; payloads must be JSON-serialisable.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+JOB_MAX_ATTEMPTS = 5
+
+# A job "running" for longer than this is assumed to have lost its worker.
+JOB_STALE_AFTER = timedelta(minutes=10)
+
+# How often the in-process runner looks for due retries without a wake-up.
+IDLE_POLL_SECONDS = 30
+
+_tasks = {}
+
+
+def task(name: str):
+    """Register the decorated function as job ``name``; it gets the payload."""
+    def register(func):
+        _tasks[name] = func
+        return func
+    return register
+
+
+def enqueue(name: str, payload: dict | None = None, delay: timedelta | None = None) -> Job:
+    """Queue task ``name``; it runs once the current transaction commits."""
+    if name not in _tasks:
+        raise KeyError(f"Unknown job task {name!r}")
+    job = Job.objects.create(
+        task=name,
+        payload=payload or {},
+        run_at=timezone.now() + (delay or timedelta()),
+    )
+    if getattr(settings, "JOBS_IN_PROCESS", True):
+        transaction.on_commit(_runner.wake)
+    return job
+
+
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=30 * 2 ** (attempts - 1))
+
+
+def _claim(job_id: int) -> bool:
+    now = timezone.now()
+    return bool(
+        Job.objects.filter(
+            Q(status=Job.Status.PENDING) | Q(status=Job.Status.RUNNING, started_at__lt=now - JOB_STALE_AFTER),
+            pk=job_id,
+        ).update(status=Job.Status.RUNNING, started_at=now, attempts=F("attempts") + 1)
+    )
+
+
+def _run(job: Job) -> None:
+    try:
+        with transaction.atomic():
+            _tasks[job.task](job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning("Job #%s (%s) failed on attempt %s", job.pk, job.task, job.attempts)
+        if job.attempts >= JOB_MAX_ATTEMPTS:
+            Job.objects.filter(pk=job.pk).update(status=Job.Status.FAILED, last_error=error)
+        else:
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.Status.PENDING, last_error=error, run_at=timezone.now() + _backoff(job.attempts)
+            )
+    else:
+        Job.objects.filter(pk=job.pk).delete()
+
+
+def run_pending(limit: int = 100) -> int:
+    """Run up to ``limit`` due jobs, oldest first; returns how many were run."""
+    now = timezone.now()
+    due = Job.objects.filter(
+        Q(status=Job.Status.PENDING, run_at__lte=now)
+        | Q(status=Job.Status.RUNNING, started_at__lt=now - JOB_STALE_AFTER)
+    ).order_by("run_at", "id").values_list("pk", flat=True)[:limit]
+
+    ran = 0
+    for job_id in list(due):
+        if not _claim(job_id):
+            continue  # another runner got it first
+        job = Job.objects.get(pk=job_id)
+        if job.task not in _tasks:
+            Job.objects.filter(pk=job.pk).update(status=Job.Status.FAILED, last_error=f"Unknown task {job.task!r}")
+            continue
+        _run(job)
+        ran += 1
+    return ran
+
+
+class _InProcessRunner:
+    """Daemon thread that drains the queue whenever it is woken."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def wake(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="pages-jobs", daemon=True)
+                self._thread.start()
+        self._event.set()
+
+    def _loop(self) -> None:
+        while True:
+            self._event.wait(IDLE_POLL_SECONDS)
+            self._event.clear()
+            close_old_connections()
+            try:
+                while run_pending():
+                    pass
+            except Exception:
+                logger.exception("In-process job runner failed")
+            finally:
+                close_old_connections()
+
+
+_runner = _InProcessRunner()
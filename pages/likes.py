@@ -0,0 +1,47 @@
+# pages/likes.py
+"""
+Setting like state.
+
+set_like() is idempotent: it inserts or deletes only when the state actually
+changes, and reports whether it did. Likes within one pair of users are
+serialised on their User rows, so a like and its reciprocal can't miss each
+other, and the "It's a match!" message is queued exactly once - by whichever
+like created the Match row, in the same transaction.
+"""
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+
+from .messaging import defer_message
+from .models import Like, Match, Thread
+
+
+def set_like(liker, liked_user, like: bool) -> tuple[bool, bool]:
+    """
+    Make ``liker``'s like of ``liked_user`` exist (``like=True``) or not.
+    Returns ``(changed, is_match)``.
+    """
+    a_id, b_id = Thread.canonical_pair(liker.pk, liked_user.pk)
+    with transaction.atomic():
+        # Row locks in id order: concurrent likes within the pair queue up
+        list(get_user_model().objects.select_for_update().filter(pk__in=(a_id, b_id)).order_by("pk").values_list("pk"))
+
+        if not like:
+            deleted, _ = Like.objects.filter(liker=liker, liked_user=liked_user).delete()
+            return bool(deleted), False
+
+        try:
+            with transaction.atomic():
+                new_like = Like.objects.create(liker=liker, liked_user=liked_user)
+        except IntegrityError:
+            # Already liked - nothing changed, nothing to announce
+            return False, Match.exists_between(liker, liked_user)
+
+        if new_like.completed_match:
+            defer_message(
+                liker, liked_user,
+                f"🎉 It's a match! You and {liked_user.username} have liked each other.",
+            )
+            return True, True
+        return True, False
@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from pages.archive import archive_thread
+from pages.models import Thread
+
+
+class Command(BaseCommand):
+    help = 'Move messages older than --days into compressed per-thread archive chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=180, help='Archive messages older than this many days')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be archived')
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        threads = Thread.objects.filter(messages__created_at__lt=before).distinct()
+
+        if options['dry_run']:
+            self.stdout.write(f'{threads.count()} threads have messages older than {options["days"]} days')
+            return
+
+        archived = 0
+        for thread in threads.iterator():
+            archived += archive_thread(thread, before)
+        self.stdout.write(f'✅ Archived {archived} messages older than {options["days"]} days')
@@ -13,6 +13,11 @@ class Command(BaseCommand):
             self.stdout.write('Importing clean data...')
             try:
                 call_command('loaddata', data_file)
+                # loaddata bypasses Profile.save(), so rebuild search documents
+                call_command('rebuild_search_index')
+                # ...and Message.save(), so rebuild the inbox summaries too
+                from pages.models import Thread, rebuild_thread_summaries
+                rebuild_thread_summaries(Thread.objects.all())
                 self.stdout.write('✅ Data imported successfully!')
             except Exception as e:
                 self.stdout.write(f'⚠️ Partial import completed with errors: {e}')
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from pages.models import Profile
+from pages.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the profile full-text search documents and index'
+
+    def handle(self, *args, **options):
+        count = rebuild_search_index(Profile.objects.all())
+        self.stdout.write(f'✅ Re-indexed {count} profiles')
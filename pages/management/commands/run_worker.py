@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from pages.jobs import run_pending
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (messages, notifications, activity logs)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the queue once and exit')
+        parser.add_argument('--sleep', type=float, default=2.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--batch', type=int, default=100, help='Jobs to claim per pass')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Job worker started')
+        while True:
+            close_old_connections()
+            ran = run_pending(limit=options['batch'])
+            if ran:
+                self.stdout.write(f'Ran {ran} jobs')
+            elif options['once']:
+                break
+            else:
+                time.sleep(options['sleep'])
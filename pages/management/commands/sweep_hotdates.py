@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from pages.hotdates import (
+    SWEEP_BATCH_SIZE, sweep_hotdate_views, sweep_past_hotdates, sweep_read_notifications,
+)
+from pages.models import HotDate, HotDateNotification, HotDateView
+
+
+class Command(BaseCommand):
+    help = 'Deactivate past Hot Dates and prune old views and read notifications (run from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--view-days', type=int, default=7, help='Delete views of dates that ended more than this many days ago')
+        parser.add_argument('--notification-days', type=int, default=30, help='Delete read notifications older than this many days')
+        parser.add_argument('--batch', type=int, default=SWEEP_BATCH_SIZE, help='Rows per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be swept')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        views_before = now - timedelta(days=options['view_days'])
+        notifications_before = now - timedelta(days=options['notification_days'])
+
+        if options['dry_run']:
+            past = HotDate.objects.filter(is_active=True, date_time__lt=now).count()
+            views = HotDateView.objects.filter(hot_date__date_time__lt=views_before).count()
+            notifications = HotDateNotification.objects.filter(is_read=True, created_at__lt=notifications_before).count()
+            self.stdout.write(f'{past} past Hot Dates, {views} stale views, {notifications} old read notifications')
+            return
+
+        batch = options['batch']
+        past = sweep_past_hotdates(now, batch)
+        views = sweep_hotdate_views(views_before, batch)
+        notifications = sweep_read_notifications(notifications_before, batch)
+        self.stdout.write(
+            f'✅ Deactivated {past} past Hot Dates, deleted {views} stale views '
+            f'and {notifications} old read notifications'
+        )
@@ -0,0 +1,94 @@
+# pages/messaging.py
+"""
+The one write path for messages.
+
+send_message() finds or creates the thread and inserts the message in one
+transaction; Message.save() folds it into the thread summary with a single
+UPDATE (no full Thread.save()). send_system_messages() does the same for one
+sender and many recipients with a fixed number of queries. defer_message()
+hands a system message to the job runner instead of sending it in-request.
+"""
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Q, Subquery
+
+from .badges import adjust_many_badge_counters
+from .jobs import enqueue
+from .models import THREAD_PREVIEW_LENGTH, Message, Thread
+
+
+def send_message(sender, recipient, text: str, thread: Thread | None = None) -> Message:
+    """Send ``text`` from ``sender`` to ``recipient``; returns the Message."""
+    with transaction.atomic():
+        if thread is None:
+            thread = Thread.get_or_create_for(sender, recipient)
+        return Message.objects.create(thread=thread, sender=sender, recipient=recipient, text=text)
+
+
+def defer_message(sender, recipient, text: str):
+    """Queue ``text`` to be sent by the job runner once this transaction commits."""
+    return enqueue("pages.send_message", {
+        "sender_id": sender.pk,
+        "recipient_id": recipient.pk,
+        "text": text,
+    })
+
+
+def _threads_for(sender_id: int, recipient_ids) -> dict[int, Thread]:
+    """Threads between ``sender_id`` and each recipient, keyed by recipient."""
+    def other(thread):
+        return thread.user_b_id if thread.user_a_id == sender_id else thread.user_a_id
+
+    sender_threads = Thread.objects.filter(
+        Q(user_a_id=sender_id, user_b_id__in=recipient_ids) | Q(user_b_id=sender_id, user_a_id__in=recipient_ids)
+    )
+    threads = {other(t): t for t in sender_threads}
+    missing = [rid for rid in recipient_ids if rid not in threads]
+    if missing:
+        new_threads = []
+        for rid in missing:
+            a_id, b_id = Thread.canonical_pair(sender_id, rid)
+            new_threads.append(Thread(user_a_id=a_id, user_b_id=b_id))
+        # ignore_conflicts: a concurrent send may have created some meanwhile
+        Thread.objects.bulk_create(new_threads, ignore_conflicts=True)
+        threads = {other(t): t for t in sender_threads.all()}
+    return threads
+
+
+def send_system_messages(sender, recipients, text: str) -> list[Message]:
+    """
+    Send the same ``text`` from ``sender`` to every user in ``recipients``.
+
+    Bypasses Message.save() and its signals, so thread summaries and badge
+    counters are updated here in bulk.
+    """
+    recipient_ids = sorted({r.pk for r in recipients} - {sender.pk})
+    if not recipient_ids:
+        return []
+
+    with transaction.atomic():
+        threads = _threads_for(sender.pk, recipient_ids)
+        created = Message.objects.bulk_create([
+            Message(thread=threads[rid], sender=sender, recipient_id=rid, text=text)
+            for rid in recipient_ids
+        ])
+        sent_at = created[-1].created_at
+        latest = Message.objects.filter(thread=OuterRef("pk")).order_by("-created_at", "-id")
+        summary = {
+            "last_message_id": Subquery(latest.values("id")[:1]),
+            "last_message_text": text[:THREAD_PREVIEW_LENGTH],
+            "last_message_at": sent_at,
+            "last_sender_id": sender.pk,
+            "updated_at": sent_at,
+        }
+        thread_ids = [t.pk for t in threads.values()]
+        # The recipient is whichever side of the pair isn't the sender
+        Thread.objects.filter(pk__in=thread_ids, user_b_id=sender.pk).update(
+            unread_count_a=F("unread_count_a") + 1, **summary
+        )
+        Thread.objects.filter(pk__in=thread_ids, user_a_id=sender.pk).update(
+            unread_count_b=F("unread_count_b") + 1, **summary
+        )
+        adjust_many_badge_counters(recipient_ids, unread_messages=1)
+    return created
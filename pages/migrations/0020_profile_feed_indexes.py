@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0019_alter_thread_options'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['my_gender', 'looking_for', '-created_at'], name='profile_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['-created_at'], name='profile_approved_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:02
+
+from django.db import migrations, models
+
+# Frozen copies of pages.search as of this migration, so later changes there
+# can't alter what it does.
+FTS_TABLE = "pages_profile_fts"
+
+DOCUMENT_FIELDS = (
+    "headline", "about", "location", "my_interests", "must_have_tags", "pets", "diet",
+)
+
+
+def build_search_document(profile):
+    user = profile.user
+    parts = [user.username, user.first_name, user.last_name]
+    parts += [getattr(profile, name) or "" for name in DOCUMENT_FIELDS]
+    return " ".join(part.replace(",", " ") for part in parts if part)
+
+
+def backfill_search_documents(Profile, vendor, schema_editor):
+    profiles = list(Profile.objects.select_related("user"))
+    for profile in profiles:
+        profile.search_document = build_search_document(profile)
+    Profile.objects.bulk_update(profiles, ["search_document"], batch_size=500)
+    if vendor == "sqlite":
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE}(rowid, search_document) VALUES (%s, %s)",
+                [(p.pk, p.search_document) for p in profiles],
+            )
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(
+            "ALTER TABLE pages_profile ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('simple', search_document)) STORED"
+        )
+        schema_editor.execute(
+            "CREATE INDEX profile_search_vector_idx ON pages_profile USING GIN (search_vector)"
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute(f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(search_document)")
+    backfill_search_documents(apps.get_model("pages", "Profile"), vendor, schema_editor)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS profile_search_vector_idx")
+        schema_editor.execute("ALTER TABLE pages_profile DROP COLUMN IF EXISTS search_vector")
+    elif vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0020_profile_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='search_document',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0021_profile_search_document'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['date_of_birth'], name='profile_dob_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:57
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('pages', '0022_profile_dob_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BadgeCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='badge_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread_messages', models.PositiveIntegerField(default=0)),
+                ('unread_hotdate_notifications', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
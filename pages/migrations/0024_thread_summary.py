@@ -0,0 +1,66 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Substr
+
+
+def backfill_summaries(apps, schema_editor):
+    # A frozen copy of rebuild_thread_summaries() as of this migration
+    Thread = apps.get_model("pages", "Thread")
+    Message = apps.get_model("pages", "Message")
+    latest = Message.objects.filter(thread=OuterRef("pk")).order_by("-created_at", "-id")
+
+    def unread(participant):
+        counts = Message.objects.filter(
+            thread=OuterRef("pk"), recipient=OuterRef(participant), is_read=False
+        ).order_by().values("thread").annotate(n=Count("id")).values("n")
+        return Coalesce(Subquery(counts), 0)
+
+    Thread.objects.update(
+        last_message_text=Coalesce(Substr(Subquery(latest.values("text")[:1]), 1, 255), Value("")),
+        last_message_at=Subquery(latest.values("created_at")[:1]),
+        last_sender_id=Subquery(latest.values("sender_id")[:1]),
+        unread_count_a=unread("user_a"),
+        unread_count_b=unread("user_b"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('pages', '0023_badgecounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='thread',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='last_message_text',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='last_sender',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='unread_count_a',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='unread_count_b',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
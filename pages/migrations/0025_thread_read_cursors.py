@@ -0,0 +1,91 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Max, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_read_cursors(apps, schema_editor):
+    """
+    Turn Message.is_read into cursors: each participant has read up to just
+    before their oldest unread message, or the whole thread if none, then
+    recompute last_message and the unread counters from the cursors.
+
+    A read message newer than an unread one lands above the cursor and counts
+    as unread again, so the counters can rise; badge counters are dropped and
+    rebuilt from the threads on first use.
+    """
+    Thread = apps.get_model("pages", "Thread")
+    Message = apps.get_model("pages", "Message")
+    BadgeCounter = apps.get_model("pages", "BadgeCounter")
+
+    def aggregate_id(func, **filters):
+        return Subquery(
+            Message.objects.filter(thread=OuterRef("pk"), **filters)
+            .order_by().values("thread").annotate(v=func("id")).values("v")
+        )
+
+    def cursor(participant):
+        return Coalesce(
+            aggregate_id(Min, recipient=OuterRef(participant), is_read=False) - 1,
+            aggregate_id(Max),
+            0,
+        )
+
+    Thread.objects.update(
+        last_read_a=cursor("user_a"),
+        last_read_b=cursor("user_b"),
+        last_message_id=Subquery(
+            Message.objects.filter(thread=OuterRef("pk")).order_by("-created_at", "-id").values("id")[:1]
+        ),
+    )
+
+    def unread(participant, read_cursor):
+        return Coalesce(
+            Subquery(
+                Message.objects.filter(thread=OuterRef("pk"), recipient=OuterRef(participant), id__gt=OuterRef(read_cursor))
+                .order_by().values("thread").annotate(n=Count("id")).values("n")
+            ),
+            0,
+        )
+
+    Thread.objects.update(
+        unread_count_a=unread("user_a", "last_read_a"),
+        unread_count_b=unread("user_b", "last_read_b"),
+    )
+    BadgeCounter.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0024_thread_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='thread',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='pages.message'),
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='last_read_a',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='last_read_b',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_read_cursors, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='message',
+            name='pages_messa_recipie_f49010_idx',
+        ),
+        migrations.RemoveField(
+            model_name='message',
+            name='is_read',
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0025_thread_read_cursors'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='thread',
+            name='cleared_a',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='cleared_b',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(condition=models.Q(('is_deleted_by_sender', False)), fields=['sender', 'thread', 'created_at'], name='message_sender_visible_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(condition=models.Q(('is_deleted_by_recipient', False)), fields=['recipient', 'thread', 'created_at'], name='message_recipient_visible_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0026_message_visibility'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MessageArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_message_id', models.PositiveBigIntegerField()),
+                ('last_message_id', models.PositiveBigIntegerField()),
+                ('first_created_at', models.DateTimeField()),
+                ('last_created_at', models.DateTimeField()),
+                ('message_count', models.PositiveIntegerField()),
+                ('payload', models.BinaryField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('thread', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archives', to='pages.thread')),
+            ],
+            options={
+                'ordering': ['-last_message_id'],
+                'indexes': [models.Index(fields=['thread', '-last_message_id'], name='pages_messa_thread__2153fe_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:06
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_matches(apps, schema_editor):
+    Like = apps.get_model("pages", "Like")
+    Match = apps.get_model("pages", "Match")
+    mutual = Like.objects.filter(
+        liker_id__lt=models.F("liked_user_id"),
+        liked_user__likes_given__liked_user_id=models.F("liker_id"),
+    ).values_list("liker_id", "liked_user_id")
+    Match.objects.bulk_create(
+        [Match(user_a_id=a_id, user_b_id=b_id) for a_id, b_id in mutual.iterator()],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('pages', '0027_message_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Match',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user_a', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches_as_a', to=settings.AUTH_USER_MODEL)),
+                ('user_b', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches_as_b', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user_a', '-created_at'], name='pages_match_user_a__6cf0a7_idx'), models.Index(fields=['user_b', '-created_at'], name='pages_match_user_b__de3503_idx')],
+                'unique_together': {('user_a', 'user_b')},
+            },
+        ),
+        migrations.RunPython(backfill_matches, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0030_job'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hotdate',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['date_time', 'id'], name='hotdate_upcoming_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:13
+
+from django.db import migrations, models
+
+
+def seed_watermarks(apps, schema_editor):
+    # Start each existing counter at the user's latest view, so dates they
+    # already looked at don't light the badge up again. Counters that don't
+    # exist yet (0025 drops them all) are seeded the same way by
+    # pages.badges.badge_counter() when it builds them.
+    BadgeCounter = apps.get_model("pages", "BadgeCounter")
+    HotDateView = apps.get_model("pages", "HotDateView")
+    BadgeCounter.objects.update(
+        hotdates_seen_at=models.Subquery(
+            HotDateView.objects.filter(user_id=models.OuterRef("user_id"))
+            .order_by("-viewed_at")
+            .values("viewed_at")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0031_hotdate_upcoming_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='badgecounter',
+            name='hotdates_seen_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='hotdate',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_cancelled', False)), fields=['created_at'], name='hotdate_new_idx'),
+        ),
+        migrations.RunPython(seed_watermarks, migrations.RunPython.noop),
+    ]
@@ -6,12 +6,19 @@ from datetime import date
 from datetime import timedelta  # ADDED
 
 from django.conf import settings
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 from django.utils.text import slugify
 from django.db.models import Q
 from django.contrib.contenttypes.models import ContentType
 
+from .search import build_search_document, index_profile, unindex_profile
+
 
 # ---------------------------------------------------------------------
 # Blog
@@ -64,6 +71,24 @@ def _today() -> date:
     return timezone.localdate()
 
 
+# Two-way gender matching for the discovery feeds. Keyed by ``looking_for``:
+# the genders that profile wants to see.
+GENDERS_WANTED = {
+    "male": ("male",),
+    "female": ("female",),
+    "bisexual": ("male", "female"),
+    "unspecified": ("male", "female", "nonbinary"),
+}
+
+# Keyed by ``my_gender``: the ``looking_for`` values that would see that profile.
+WANTED_BY_GENDER = {
+    "male": ("male", "bisexual", "unspecified"),
+    "female": ("female", "bisexual", "unspecified"),
+    "nonbinary": ("unspecified",),
+    "unspecified": ("male", "female", "bisexual", "unspecified"),
+}
+
+
 class Profile(models.Model):
     """User's dating profile. One-to-one with the auth user."""
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
@@ -151,10 +176,53 @@ class Profile(models.Model):
         max_length=20, choices=Intent.choices, default=Intent.ANY
     )
 
+    # Denormalised searchable text, rebuilt on every save (see pages/search.py)
+    search_document = models.TextField(blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Backs the dashboard feed: approved profiles bucketed by
+            # (my_gender, looking_for), newest first. Partial so unapproved
+            # profiles never enter the index.
+            models.Index(
+                fields=["my_gender", "looking_for", "-created_at"],
+                condition=Q(is_approved=True),
+                name="profile_feed_idx",
+            ),
+            # Age filters in search (date_of_birth range).
+            models.Index(
+                fields=["date_of_birth"],
+                condition=Q(is_approved=True),
+                name="profile_dob_idx",
+            ),
+            # Unfiltered approved feed (staff, browse_preview).
+            models.Index(
+                fields=["-created_at"],
+                condition=Q(is_approved=True),
+                name="profile_approved_recent_idx",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.search_document = build_search_document(self)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "search_document"}
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         uname = getattr(self.user, "username", None) or (self.user.get_username() if self.user else "user")
         return f"Profile #{self.pk} (@{uname})"
 
+    @classmethod
+    def compatible_with(cls, profile: "Profile"):
+        """Approved profiles that pass the two-way gender match with ``profile``."""
+        return cls.objects.filter(
+            is_approved=True,
+            my_gender__in=GENDERS_WANTED.get(profile.looking_for, GENDERS_WANTED["unspecified"]),
+            looking_for__in=WANTED_BY_GENDER.get(profile.my_gender, ("unspecified",)),
+        )
+
     def allow_full_access(self) -> bool:
         """Full dashboard access only when complete + approved."""
         return bool(self.is_complete and self.is_approved)
@@ -171,6 +239,11 @@ class Profile(models.Model):
 
     @property
     def primary_image(self) -> "ProfileImage | None":
+        # Use prefetch_related('images') when the caller did it, so grids of
+        # profiles stay at a constant number of queries.
+        prefetched = getattr(self, "_prefetched_objects_cache", {}).get("images")
+        if prefetched is not None:
+            return next((img for img in prefetched if img.is_primary), None)
         return self.images.filter(is_primary=True).first()
 
     @property
@@ -226,6 +299,17 @@ class Profile(models.Model):
         return getattr(self, field_name, default)
 
 
+@receiver(post_save, sender=Profile)
+def _index_profile(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_profile(instance)
+
+
+@receiver(post_delete, sender=Profile)
+def _unindex_profile(sender, instance, **kwargs):
+    unindex_profile(instance.pk)
+
+
 # ---------------------------------------------------------------------
 # Profile Images
 # ---------------------------------------------------------------------
@@ -258,11 +342,36 @@ class ProfileImage(models.Model):
 # Messages
 # ---------------------------------------------------------------------
 
+# Characters of the newest message kept on the thread for the inbox preview.
+THREAD_PREVIEW_LENGTH = 255
+
+
 class Thread(models.Model):
     user_a = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="threads_as_a")
     user_b = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="threads_as_b")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    # Inbox summary, kept in step with Message.save() so the inbox never has
+    # to read the messages themselves.
+    last_message = models.ForeignKey(
+        "Message", on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    last_message_text = models.CharField(max_length=THREAD_PREVIEW_LENGTH, blank=True, default="")
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    last_sender = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    unread_count_a = models.PositiveIntegerField(default=0)  # unread by user_a
+    unread_count_b = models.PositiveIntegerField(default=0)  # unread by user_b
+
+    # Read cursors: each participant has read every message up to this id.
+    last_read_a = models.PositiveBigIntegerField(default=0)
+    last_read_b = models.PositiveBigIntegerField(default=0)
+
+    # Clear cursors: each participant deleted the conversation up to this id.
+    cleared_a = models.PositiveBigIntegerField(default=0)
+    cleared_b = models.PositiveBigIntegerField(default=0)
     
     class Meta:
         unique_together = (("user_a", "user_b"),)
@@ -274,14 +383,90 @@ class Thread(models.Model):
     
     def get_other_user(self, current_user):  # ADD THIS METHOD
         """Return the other user in the conversation"""
-        if self.user_a == current_user:
+        if self.user_a_id == current_user.id:
             return self.user_b
         return self.user_a
-    
-    @property
-    def last_message(self):  # ADD THIS METHOD
-        """Return the last message in the thread"""
-        return self.messages.order_by('-created_at').first()
+
+    def _unread_field(self, user_id: int) -> str:
+        return "unread_count_a" if user_id == self.user_a_id else "unread_count_b"
+
+    def _read_field(self, user_id: int) -> str:
+        return "last_read_a" if user_id == self.user_a_id else "last_read_b"
+
+    def unread_count_for(self, user) -> int:
+        return getattr(self, self._unread_field(user.id))
+
+    def _cleared_field(self, user_id: int) -> str:
+        return "cleared_a" if user_id == self.user_a_id else "cleared_b"
+
+    def cleared_cursor_for(self, user_id: int) -> int:
+        """Id of the newest message ``user_id`` deleted from their view (0 = none)."""
+        return getattr(self, self._cleared_field(user_id))
+
+    def read_cursor_for(self, user_id: int) -> int:
+        """Id of the newest message ``user_id`` has read here (0 = none)."""
+        return getattr(self, self._read_field(user_id))
+
+    def record_message(self, message) -> None:
+        """Fold a newly created ``message`` into the summary columns."""
+        unread = self._unread_field(message.recipient_id)
+        Thread.objects.filter(pk=self.pk).update(**{
+            "last_message_id": message.pk,
+            "last_message_text": (message.text or "")[:THREAD_PREVIEW_LENGTH],
+            "last_message_at": message.created_at,
+            "last_sender_id": message.sender_id,
+            "updated_at": message.created_at,
+            unread: F(unread) + 1,
+        })
+
+    def mark_read_for(self, user, up_to: int | None = None) -> int:
+        """
+        Move ``user``'s read cursor up to message ``up_to`` - by default the
+        newest message this instance loaded: one single-row UPDATE, skipped
+        when nothing is unread. Messages after it stay unread. Returns how
+        many messages became read.
+        """
+        unread, read = self._unread_field(user.id), self._read_field(user.id)
+        if up_to is None:
+            up_to, marked = self.last_message_id, getattr(self, unread)
+        elif up_to > getattr(self, read):
+            # Messages may have arrived since this row was loaded; count the
+            # ones actually being marked.
+            marked = self.messages.filter(
+                recipient_id=user.id, id__gt=getattr(self, read), id__lte=up_to
+            ).count()
+        else:
+            marked = 0
+        if not marked or up_to is None:
+            return 0
+        updated = Thread.objects.filter(pk=self.pk, **{f"{read}__lt": up_to}).update(**{
+            read: up_to, unread: Greatest(F(unread) - marked, 0),
+        })
+        setattr(self, unread, max(getattr(self, unread) - marked, 0))
+        setattr(self, read, up_to)
+        return marked if updated else 0
+
+    def clear_for(self, user) -> int:
+        """
+        Delete the conversation from ``user``'s view: moves their clear and
+        read cursors up to the newest message this instance loaded in one
+        single-row UPDATE. Messages stay stored for the other participant.
+        Returns the unread messages discarded.
+        """
+        if self.last_message_id is None:
+            return 0
+        unread = self._unread_field(user.id)
+        discarded = getattr(self, unread)
+        cleared, read = self._cleared_field(user.id), self._read_field(user.id)
+        updated = Thread.objects.filter(pk=self.pk, **{f"{cleared}__lt": self.last_message_id}).update(**{
+            cleared: self.last_message_id,
+            read: Greatest(F(read), self.last_message_id),
+            unread: Greatest(F(unread) - discarded, 0),
+        })
+        setattr(self, cleared, self.last_message_id)
+        setattr(self, read, self.last_message_id)
+        setattr(self, unread, 0)
+        return discarded if updated else 0
     
     @staticmethod
     def canonical_pair(u1_id: int, u2_id: int) -> tuple[int, int]:
@@ -298,31 +483,113 @@ class Thread(models.Model):
         from django.db.models import Q
         return cls.objects.filter(Q(user_a=user) | Q(user_b=user))
 
+    @classmethod
+    def inbox_for(cls, user):
+        """``user``'s threads, minus those cleared with nothing newer since."""
+        return cls.objects.filter(
+            Q(user_a=user) & (Q(last_message__isnull=True) | Q(last_message_id__gt=F("cleared_a")))
+            | Q(user_b=user) & (Q(last_message__isnull=True) | Q(last_message_id__gt=F("cleared_b")))
+        )
+
+    @classmethod
+    def mark_all_read_for(cls, user, threads) -> int | None:
+        """
+        Mark the already loaded ``threads`` read for ``user`` up to the
+        newest message each one loaded: one UPDATE per side (user_a/user_b)
+        however many threads. Returns the total marked, or None when a
+        concurrent mark already moved some of the cursors and the total is
+        unknown (recount the badge then).
+        """
+        total, exact = 0, True
+        for side in ("a", "b"):
+            read, unread = f"last_read_{side}", f"unread_count_{side}"
+            rows = [
+                thread for thread in threads
+                if getattr(thread, f"user_{side}_id") == user.id
+                and getattr(thread, unread) and thread.last_message_id is not None
+            ]
+            if not rows:
+                continue
+            cursor = models.Case(
+                *[models.When(pk=thread.pk, then=models.Value(thread.last_message_id)) for thread in rows],
+                output_field=models.PositiveBigIntegerField(),
+            )
+            marked = models.Case(
+                *[models.When(pk=thread.pk, then=models.Value(getattr(thread, unread))) for thread in rows],
+                output_field=models.PositiveIntegerField(),
+            )
+            moved_on = Q()
+            for thread in rows:
+                moved_on |= Q(pk=thread.pk, **{f"{read}__lt": thread.last_message_id})
+            updated = cls.objects.filter(moved_on).update(**{
+                read: cursor, unread: Greatest(F(unread) - marked, 0),
+            })
+            exact = exact and updated == len(rows)
+            for thread in rows:
+                total += getattr(thread, unread)
+                setattr(thread, read, thread.last_message_id)
+                setattr(thread, unread, 0)
+        return total if exact else None
+
+class MessageQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """
+        Messages ``user`` may see as a participant, filtered in SQL: not
+        soft-deleted on their side and newer than their clear cursor.
+        """
+        return self.filter(
+            Q(sender=user, is_deleted_by_sender=False) | Q(recipient=user, is_deleted_by_recipient=False),
+            Q(thread__user_a=user, id__gt=F("thread__cleared_a"))
+            | Q(thread__user_b=user, id__gt=F("thread__cleared_b")),
+        )
+
+
 class Message(models.Model):
     thread = models.ForeignKey(Thread, on_delete=models.CASCADE, related_name="messages")
     sender = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="sent_messages")
     recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="received_messages")
     text = models.TextField()
-    is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
     is_deleted_by_sender = models.BooleanField(default=False)
     is_deleted_by_recipient = models.BooleanField(default=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
+    objects = MessageQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["recipient", "is_read"]),
             models.Index(fields=["thread", "created_at"]),
+            # One per side of MessageQuerySet.visible_to()
+            models.Index(
+                fields=["sender", "thread", "created_at"],
+                condition=Q(is_deleted_by_sender=False),
+                name="message_sender_visible_idx",
+            ),
+            models.Index(
+                fields=["recipient", "thread", "created_at"],
+                condition=Q(is_deleted_by_recipient=False),
+                name="message_recipient_visible_idx",
+            ),
         ]
 
     def __str__(self) -> str:
         return f"Msg(t={self.thread_id} from={self.sender_id} to={self.recipient_id})"
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        # The thread summary commits (or rolls back) together with the message
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.thread.record_message(self)
+
     def is_visible_to_user(self, user):
         if user.is_superuser:
             return True
+        if self.pk <= self.thread.cleared_cursor_for(user.id):
+            return False
         if user == self.sender and not self.is_deleted_by_sender:
             return True
         if user == self.recipient and not self.is_deleted_by_recipient:
@@ -333,10 +600,103 @@ class Message(models.Model):
     def short_text(self):
         return (self.text or "")[:80]
 
+    @property
+    def is_read(self) -> bool:
+        """Whether the recipient's read cursor on the thread has passed this message."""
+        return self.pk <= self.thread.read_cursor_for(self.recipient_id)
+
+
+def rebuild_thread_summaries(threads) -> int:
+    """
+    Recompute the Thread summary columns of ``threads`` from their messages
+    and read cursors in one UPDATE. For paths that bypass Message.save()
+    (loaddata, migrations, bulk deletes).
+    """
+    from django.db.models import Count, OuterRef, Subquery, Value
+    from django.db.models.functions import Coalesce, Substr
+
+    message_model = threads.model._meta.get_field("messages").related_model
+    latest = message_model.objects.filter(thread=OuterRef("pk")).order_by("-created_at", "-id")
+
+    def unread(participant, cursor):
+        counts = message_model.objects.filter(
+            thread=OuterRef("pk"), recipient=OuterRef(participant), id__gt=OuterRef(cursor)
+        ).order_by().values("thread").annotate(n=Count("id")).values("n")
+        return Coalesce(Subquery(counts), 0)
+
+    return threads.update(
+        last_message_id=Subquery(latest.values("id")[:1]),
+        last_message_text=Coalesce(
+            Substr(Subquery(latest.values("text")[:1]), 1, THREAD_PREVIEW_LENGTH), Value("")
+        ),
+        last_message_at=Subquery(latest.values("created_at")[:1]),
+        last_sender_id=Subquery(latest.values("sender_id")[:1]),
+        unread_count_a=unread("user_a", "last_read_a"),
+        unread_count_b=unread("user_b", "last_read_b"),
+    )
+
+
+
+class MessageArchive(models.Model):
+    """
+    Cold storage for old messages: one zlib-compressed JSON list of up to
+    pages.archive.ARCHIVE_CHUNK_SIZE messages of a thread, oldest first.
+    Written by the archive_messages command, read back by pages.archive.
+    """
+    thread = models.ForeignKey(Thread, on_delete=models.CASCADE, related_name="archives")
+    first_message_id = models.PositiveBigIntegerField()
+    last_message_id = models.PositiveBigIntegerField()
+    first_created_at = models.DateTimeField()
+    last_created_at = models.DateTimeField()
+    message_count = models.PositiveIntegerField()
+    payload = models.BinaryField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-last_message_id"]
+        indexes = [models.Index(fields=["thread", "-last_message_id"])]
+
+    def __str__(self) -> str:
+        return f"Archive(t={self.thread_id} msgs={self.first_message_id}..{self.last_message_id})"
+
+
+BLOCK_STATE_TTL = 60 * 30
+
+
+def _block_state_key(user_id: int) -> str:
+    return f"pages:block_state:{user_id}"
+
+
+def block_state(user) -> dict[str, frozenset[int]]:
+    """
+    Cached block relations for ``user``: ``blocked`` (ids they blocked) and
+    ``blocked_by`` (ids that blocked them). Loaded with one query and dropped
+    whenever a Block touching the user is saved or deleted.
+    """
+    key = _block_state_key(user.pk)
+    state = cache.get(key)
+    if state is None:
+        blocked, blocked_by = set(), set()
+        for blocker_id, blocked_id in Block.objects.filter(
+            Q(blocker_id=user.pk) | Q(blocked_id=user.pk)
+        ).values_list("blocker_id", "blocked_id"):
+            if blocker_id == user.pk:
+                blocked.add(blocked_id)
+            else:
+                blocked_by.add(blocker_id)
+        state = {"blocked": frozenset(blocked), "blocked_by": frozenset(blocked_by)}
+        cache.set(key, state, BLOCK_STATE_TTL)
+    return state
+
+
+def hidden_user_ids(user) -> frozenset[int]:
+    """Users hidden from ``user`` in either direction of a block."""
+    state = block_state(user)
+    return state["blocked"] | state["blocked_by"]
+
 
 def is_blocked(a, b) -> bool:
-    from .models import Block
-    return Block.objects.filter(Q(blocker=a, blocked=b) | Q(blocker=b, blocked=a)).exists()
+    return b.pk in hidden_user_ids(a)
 
 
 class Block(models.Model):
@@ -349,6 +709,11 @@ class Block(models.Model):
         return f"{self.blocker_id} ⟂ {self.blocked_id}"
 
 
+@receiver([post_save, post_delete], sender=Block)
+def _invalidate_block_state(sender, instance, **kwargs):
+    cache.delete_many([_block_state_key(instance.blocker_id), _block_state_key(instance.blocked_id)])
+
+
 class Like(models.Model):
     liker = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='likes_given')
     liked_user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='likes_received')
@@ -357,11 +722,111 @@ class Like(models.Model):
     
     class Meta:
         unique_together = ['liker', 'liked_user']
+        # Keyset pagination of the likes pages, newest first
+        indexes = [
+            models.Index(fields=['liker', '-created_at'], name='like_given_recent_idx'),
+            models.Index(fields=['liked_user', '-created_at'], name='like_received_recent_idx'),
+        ]
     
     def __str__(self):
         return f"{self.liker.username} likes {self.liked_user.username}"
 
 
+class Match(models.Model):
+    """
+    A mutual like, stored once per pair as (lower id, higher id) like Thread.
+    Created and removed by the Like signal receivers below.
+    """
+    user_a = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="matches_as_a")
+    user_b = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="matches_as_b")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = (("user_a", "user_b"),)
+        indexes = [
+            models.Index(fields=["user_a", "-created_at"]),
+            models.Index(fields=["user_b", "-created_at"]),
+        ]
+
+    def __str__(self):
+        return f"Match({self.user_a_id}, {self.user_b_id})"
+
+    def get_other_user(self, current_user):
+        return self.user_b if self.user_a_id == current_user.id else self.user_a
+
+    @classmethod
+    def for_user(cls, user):
+        return cls.objects.filter(Q(user_a=user) | Q(user_b=user))
+
+    @classmethod
+    def exists_between(cls, u1, u2) -> bool:
+        a_id, b_id = Thread.canonical_pair(u1.id, u2.id)
+        return cls.objects.filter(user_a_id=a_id, user_b_id=b_id).exists()
+
+
+@receiver(post_save, sender=Like)
+def _like_saved(sender, instance, created, raw=False, **kwargs):
+    # ``completed_match`` tells the caller whether this like made the Match
+    instance.completed_match = False
+    if not created or raw:
+        return
+    if Like.objects.filter(liker_id=instance.liked_user_id, liked_user_id=instance.liker_id).exists():
+        a_id, b_id = Thread.canonical_pair(instance.liker_id, instance.liked_user_id)
+        _, instance.completed_match = Match.objects.get_or_create(user_a_id=a_id, user_b_id=b_id)
+
+
+@receiver(post_delete, sender=Like)
+def _like_deleted(sender, instance, **kwargs):
+    a_id, b_id = Thread.canonical_pair(instance.liker_id, instance.liked_user_id)
+    Match.objects.filter(user_a_id=a_id, user_b_id=b_id).delete()
+
+
+# ---------------------------------------------------------------------
+# Header badge counters
+# ---------------------------------------------------------------------
+
+class BadgeCounter(models.Model):
+    """Per-user header badge counters, adjusted on write (see pages/badges.py)."""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name="badge_counter")
+    unread_messages = models.PositiveIntegerField(default=0)
+    unread_hotdate_notifications = models.PositiveIntegerField(default=0)
+    # Hot Dates created after this are "new" on the badge (within NEW_HOTDATE_WINDOW).
+    hotdates_seen_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Badges({self.user_id}: {self.unread_messages} msgs, {self.unread_hotdate_notifications} notices)"
+
+
+# ---------------------------------------------------------------------
+# Background jobs
+# ---------------------------------------------------------------------
+
+class Job(models.Model):
+    """A deferred side effect, run by pages.jobs (see enqueue/run_pending)."""
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        FAILED = "failed", "Failed"
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["run_at"], condition=Q(status="pending"), name="job_pending_idx"),
+        ]
+
+    def __str__(self):
+        return f"Job #{self.pk} {self.task} ({self.status})"
+
+
 # ---------------------------------------------------------------------
 # Private Access Requests
 # ---------------------------------------------------------------------
@@ -392,6 +857,46 @@ class PrivateAccessRequest(models.Model):
         return self.status == self.Status.APPROVED
 
 
+def annotate_relationships(viewer, users):
+    """
+    Attach ``relationship_state`` to each user in ``users`` as seen by
+    ``viewer`` - liked, liked_me, matched, blocked, private_access - using one
+    query for the whole page. The profile_tags filters read it instead of
+    running a query per card.
+    """
+    users = [u for u in users if u is not None]
+    if not users or not viewer.is_authenticated:
+        return users
+    from django.contrib.auth import get_user_model
+    from django.db.models import Exists, OuterRef
+
+    access_cutoff = timezone.now() - timedelta(hours=72)
+    rows = get_user_model().objects.filter(pk__in={u.pk for u in users}).annotate(
+        liked=Exists(Like.objects.filter(liker=viewer, liked_user=OuterRef("pk"))),
+        liked_me=Exists(Like.objects.filter(liker=OuterRef("pk"), liked_user=viewer)),
+        blocked=Exists(Block.objects.filter(blocker=viewer, blocked=OuterRef("pk"))),
+        private_access=Exists(PrivateAccessRequest.objects.filter(
+            requester=viewer,
+            target_user=OuterRef("pk"),
+            status=PrivateAccessRequest.Status.APPROVED,
+            reviewed_at__gte=access_cutoff,
+        )),
+    ).values("pk", "liked", "liked_me", "blocked", "private_access")
+
+    states = {row.pop("pk"): row for row in rows}
+    for user in users:
+        state = states.get(user.pk, {})
+        user.relationship_state = {
+            "viewer_id": viewer.pk,
+            "liked": state.get("liked", False),
+            "liked_me": state.get("liked_me", False),
+            "matched": state.get("liked", False) and state.get("liked_me", False),
+            "blocked": state.get("blocked", False),
+            "private_access": viewer.is_superuser or state.get("private_access", False),
+        }
+    return users
+
+
 # ---------------------------------------------------------------------
 # User Activity Tracking
 # ---------------------------------------------------------------------
@@ -416,7 +921,8 @@ class UserActivity(models.Model):
     target_object_id = models.PositiveIntegerField(null=True, blank=True)
     target_content_type = models.ForeignKey(ContentType, null=True, blank=True, on_delete=models.SET_NULL)
     extra_data = models.JSONField(default=dict, blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # When the action happened - set from the request, not when the job ran
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         verbose_name_plural = "User Activities"
@@ -428,27 +934,53 @@ class UserActivity(models.Model):
 
 # Utility function to log activities
 def log_user_activity(user, action, request=None, target_object=None, **extra_data):
-    """Log user activity for admin tracking"""
-    activity = UserActivity(
-        user=user,
-        action=action,
-        ip_address=request.META.get('REMOTE_ADDR') if request else None,
-        user_agent=request.META.get('HTTP_USER_AGENT', '') if request else '',
-        extra_data=extra_data
-    )
-    
+    """Log user activity for admin tracking (written by the job runner)"""
+    from .jobs import enqueue
+
+    payload = {
+        'user_id': user.pk,
+        'action': action,
+        'ip_address': request.META.get('REMOTE_ADDR') if request else None,
+        'user_agent': request.META.get('HTTP_USER_AGENT', '') if request else '',
+        'extra_data': extra_data,
+        'timestamp': timezone.now().isoformat(),
+    }
     if target_object:
-        activity.target_object_id = target_object.id
-        activity.target_content_type = ContentType.objects.get_for_model(target_object)
+        payload['target_object_id'] = target_object.id
+        payload['target_content_type_id'] = ContentType.objects.get_for_model(target_object).id
     
-    activity.save()
-    return activity
+    return enqueue('pages.record_activity', payload)
 
 
 # ---------------------------------------------------------------------
 # Hot Dates (ADDED FROM OLDER VERSION)
 # ---------------------------------------------------------------------
 
+# Keyed by the viewer's ``my_gender``: the Hot Date audiences they may see.
+AUDIENCES_FOR_GENDER = {
+    "female": ("anyone", "women_only"),
+    "male": ("anyone", "men_only"),
+}
+
+
+class HotDateQuerySet(models.QuerySet):
+    def upcoming(self):
+        """Active dates that haven't started yet (hotdate_upcoming_idx)."""
+        return self.filter(is_active=True, date_time__gte=timezone.now())
+
+    def visible_to(self, user, gender: str | None = None):
+        """Dates whose audience admits a viewer of ``gender``, plus their own."""
+        return self.filter(
+            Q(audience__in=AUDIENCES_FOR_GENDER.get(gender, ("anyone",))) | Q(host=user)
+        )
+
+    def with_seen(self, user):
+        """Annotate ``seen``: whether ``user`` has a HotDateView for the row."""
+        return self.annotate(
+            seen=models.Exists(HotDateView.objects.filter(user=user, hot_date=models.OuterRef("pk")))
+        )
+
+
 class HotDate(models.Model):
     """Hot Date - pre-arranged dates that users can join"""
     
@@ -485,9 +1017,18 @@ class HotDate(models.Model):
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = HotDateQuerySet.as_manager()
     
     class Meta:
         ordering = ['date_time']
+        indexes = [
+            # The upcoming listing: soonest first, keyset-paged on (date_time, id).
+            # Cancelled dates stay in it (shown struck through) until they pass.
+            models.Index(fields=['date_time', 'id'], condition=Q(is_active=True), name='hotdate_upcoming_idx'),
+            # The "new Hot Dates" badge: a range count on created_at.
+            models.Index(fields=['created_at'], condition=Q(is_active=True, is_cancelled=False), name='hotdate_new_idx'),
+        ]
     
     def __str__(self):
         return f"Hot Date: {self.activity} by {self.host.username} at {self.date_time}"
@@ -517,7 +1058,7 @@ class HotDateParticipant(models.Model):
 
 
 class HotDateView(models.Model):
-    """Track when users view Hot Dates (for notification counting)"""
+    """A user's explicit interest in a Hot Date (marked seen / messaged the host)"""
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="viewed_hotdates")
     hot_date = models.ForeignKey(HotDate, on_delete=models.CASCADE, related_name="views")
     viewed_at = models.DateTimeField(auto_now_add=True)
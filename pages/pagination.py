@@ -0,0 +1,104 @@
+# pages/pagination.py
+"""
+Keyset (cursor) pagination for the newest-first feeds and other listings
+ordered on a timestamp.
+
+Unlike django.core.paginator.Paginator this never issues a COUNT(*) and never
+uses OFFSET: every page is a single ``WHERE (created_at, id) < cursor ...
+LIMIT n+1`` query, so page 50 costs the same as page 1.
+"""
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+
+class CursorPage:
+    """One page of results plus the cursors needed to move either way."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+
+def encode_cursor(created_at: datetime, pk: int) -> str:
+    raw = f"{created_at.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(value: str | None) -> tuple[datetime, int] | None:
+    """Return ``(created_at, pk)`` or None for a missing/garbled cursor."""
+    if not value:
+        return None
+    try:
+        padded = value + "=" * (-len(value) % 4)
+        stamp, pk = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(stamp), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def paginate_by_cursor(queryset, after=None, before=None, per_page=12, field="created_at", descending=True):
+    """
+    Page ``queryset`` newest-first on ``(field, id)``, or oldest-first when
+    ``descending`` is False (e.g. upcoming events, soonest first).
+
+    ``after`` continues forwards through the ordering, ``before`` walks back
+    towards the start; both are cursors previously handed out on a CursorPage.
+    Garbled cursors fall back to the first page.
+    """
+    after = decode_cursor(after)
+    before = decode_cursor(before) if after is None else None
+    forward, back = ("lt", "gt") if descending else ("gt", "lt")
+    order, reverse = ((f"-{field}", "-id"), (field, "id"))
+    if not descending:
+        order, reverse = reverse, order
+
+    def beyond(cursor, op):
+        stamp, pk = cursor
+        return Q(**{f"{field}__{op}": stamp}) | Q(**{field: stamp, f"id__{op}": pk})
+
+    if before is not None:
+        rows = list(
+            queryset.filter(beyond(before, back))
+            .order_by(*reverse)[: per_page + 1]
+        )
+        more_back = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_back, has_forward = more_back, True
+    else:
+        if after is not None:
+            queryset = queryset.filter(beyond(after, forward))
+        rows = list(queryset.order_by(*order)[: per_page + 1])
+        has_forward = len(rows) > per_page
+        rows = rows[:per_page]
+        has_back = after is not None
+
+    def cursor_for(obj):
+        return encode_cursor(getattr(obj, field), obj.pk)
+
+    return CursorPage(
+        rows,
+        next_cursor=cursor_for(rows[-1]) if rows and has_forward else None,
+        previous_cursor=cursor_for(rows[0]) if rows and has_back else None,
+    )
@@ -0,0 +1,171 @@
+# pages/search.py
+"""
+Full-text profile search over ``Profile.search_document``.
+
+PostgreSQL: a generated ``search_vector`` tsvector column with a GIN index.
+SQLite (local runs): an FTS5 table keyed by profile id, refreshed from the
+Profile save/delete signals. Both are created by migration 0021. Any other
+backend falls back to a single icontains on the document.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from datetime import date
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Value
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+FTS_TABLE = "pages_profile_fts"
+
+# Most relevant first; used when a search replaces the normal feed order.
+SEARCH_RESULTS_LIMIT = 48
+
+# Matching ids per filter combination are shared between users of the
+# same feed scope for this long.
+SEARCH_CACHE_TTL = 60
+
+# Profile fields that feed the search document (plus the user's names).
+DOCUMENT_FIELDS = (
+    "headline", "about", "location", "my_interests", "must_have_tags", "pets", "diet",
+)
+
+
+def build_search_document(profile) -> str:
+    """Flatten the searchable text of ``profile`` into one string."""
+    user = profile.user
+    parts = [user.username, user.first_name, user.last_name]
+    parts += [getattr(profile, name) or "" for name in DOCUMENT_FIELDS]
+    # Interests/tags are CSV strings - split them into words.
+    return " ".join(part.replace(",", " ") for part in parts if part)
+
+
+def _terms(query: str) -> list[str]:
+    return re.findall(r"\w+", query.lower())
+
+
+def search_profiles(queryset, query: str):
+    """
+    Filter ``queryset`` to profiles matching every term of ``query`` (prefix
+    match) and order by relevance, newest first on ties.
+    """
+    terms = _terms(query)
+    if not terms:
+        return queryset.none()
+
+    if connection.vendor == "postgresql":
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        queryset = queryset.filter(
+            RawSQL("pages_profile.search_vector @@ to_tsquery('simple', %s)", (tsquery,), output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL("ts_rank(pages_profile.search_vector, to_tsquery('simple', %s))", (tsquery,), output_field=FloatField())
+        )
+    elif connection.vendor == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        queryset = queryset.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,))
+        ).annotate(
+            # FTS5 rank is bm25 negated: smaller is better.
+            search_rank=RawSQL(
+                f"(SELECT -rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = pages_profile.id)",
+                (match,),
+                output_field=FloatField(),
+            )
+        )
+    else:
+        for term in terms:
+            queryset = queryset.filter(search_document__icontains=term)
+        queryset = queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    return queryset.order_by("-search_rank", "-created_at", "-id")
+
+
+def _years_ago(today: date, years: int) -> date:
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:  # 29 February
+        return today.replace(year=today.year - years, day=28)
+
+
+def apply_search_filters(queryset, filters: dict):
+    """
+    Narrow ``queryset`` by the cleaned ProfileSearchForm ``filters``.
+
+    Ages become a ``date_of_birth`` range (profile_dob_idx); ``q`` and
+    ``interests`` go through the full-text index and order by relevance.
+    """
+    today = timezone.localdate()
+    if filters.get("min_age"):
+        queryset = queryset.filter(date_of_birth__lte=_years_ago(today, filters["min_age"]))
+    if filters.get("max_age"):
+        queryset = queryset.filter(date_of_birth__gt=_years_ago(today, filters["max_age"] + 1))
+    if filters.get("gender"):
+        queryset = queryset.filter(my_gender=filters["gender"])
+    if filters.get("location"):
+        queryset = queryset.filter(location__istartswith=filters["location"])
+    if filters.get("intent"):
+        queryset = queryset.filter(preferred_intent=filters["intent"])
+    if filters.get("distance"):
+        queryset = queryset.filter(preferred_distance=filters["distance"])
+
+    text = " ".join(filter(None, [filters.get("q"), (filters.get("interests") or "").replace(",", " ")]))
+    if text:
+        return search_profiles(queryset, text)
+    return queryset.order_by("-created_at", "-id")
+
+
+def search_profile_ids(queryset, filters: dict, scope) -> list[int]:
+    """
+    Ids of the best SEARCH_RESULTS_LIMIT matches, cached per ``(scope,
+    filters)``. ``scope`` must identify everything ``queryset`` depends on;
+    per-user exclusions (blocks, self) belong after this lookup.
+    """
+    raw = json.dumps([scope, filters], sort_keys=True, default=str)
+    key = "pages:search:" + hashlib.md5(raw.encode()).hexdigest()
+    ids = cache.get(key)
+    if ids is None:
+        ids = list(apply_search_filters(queryset, filters).values_list("id", flat=True)[:SEARCH_RESULTS_LIMIT])
+        cache.set(key, ids, SEARCH_CACHE_TTL)
+    return ids
+
+
+def index_profile(profile) -> None:
+    """Refresh one profile's row in the SQLite FTS table."""
+    if connection.vendor != "sqlite":
+        return  # PostgreSQL's generated column tracks search_document itself
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [profile.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, search_document) VALUES (%s, %s)",
+            [profile.pk, profile.search_document],
+        )
+
+
+def unindex_profile(profile_id: int) -> None:
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [profile_id])
+
+
+def rebuild_search_index(profiles) -> int:
+    """Recompute ``search_document`` for ``profiles`` and re-index them."""
+    profiles = list(profiles.select_related("user"))
+    for profile in profiles:
+        profile.search_document = build_search_document(profile)
+    if profiles:
+        type(profiles[0]).objects.bulk_update(profiles, ["search_document"], batch_size=500)
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(p.pk,) for p in profiles]
+            )
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE}(rowid, search_document) VALUES (%s, %s)",
+                [(p.pk, p.search_document) for p in profiles],
+            )
+    return len(profiles)
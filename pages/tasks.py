@@ -0,0 +1,32 @@
+# pages/tasks.py
+"""Job tasks (see pages/jobs.py). Imported from PagesConfig.ready()."""
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+
+from .hotdates import notify_hotdate_viewers
+from .jobs import task
+from .messaging import send_message
+from .models import HotDate, UserActivity
+
+
+@task("pages.send_message")
+def send_message_task(payload):
+    users = get_user_model().objects.in_bulk([payload["sender_id"], payload["recipient_id"]])
+    sender, recipient = users.get(payload["sender_id"]), users.get(payload["recipient_id"])
+    if sender and recipient:  # either may have been deleted meanwhile
+        send_message(sender, recipient, payload["text"])
+
+
+@task("pages.notify_hotdate_viewers")
+def notify_hotdate_viewers_task(payload):
+    hot_date = HotDate.objects.filter(pk=payload["hot_date_id"]).first()
+    if hot_date:
+        notify_hotdate_viewers(hot_date, payload["notification_type"], payload["message"])
+
+
+@task("pages.record_activity")
+def record_activity_task(payload):
+    if "timestamp" in payload:  # jobs queued before the payload carried it use the default
+        payload["timestamp"] = datetime.fromisoformat(payload["timestamp"])
+    UserActivity.objects.create(**payload)
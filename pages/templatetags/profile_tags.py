@@ -1,14 +1,25 @@
 # pages/templatetags/profile_tags.py
 from django import template
+from django.core.files.storage import default_storage
 from ..models import Like, Block
 
 register = template.Library()
 
+def _relationship_state(user, target_user):
+    """State set by models.annotate_relationships(), if it was for ``user``."""
+    state = getattr(target_user, 'relationship_state', None)
+    if state is not None and state['viewer_id'] == user.pk:
+        return state
+    return None
+
 @register.filter
 def has_liked(user, target_user):
     """Check if user has liked target user"""
     if not user.is_authenticated:
         return False
+    state = _relationship_state(user, target_user)
+    if state is not None:
+        return state['liked']
     return Like.objects.filter(liker=user, liked_user=target_user).exists()
 
 @register.filter
@@ -16,16 +27,43 @@ def has_blocked(user, target_user):
     """Check if user has blocked target user"""
     if not user.is_authenticated:
         return False
+    state = _relationship_state(user, target_user)
+    if state is not None:
+        return state['blocked']
     return Block.objects.filter(blocker=user, blocked=target_user).exists()
 
+@register.filter
+def is_match(user, target_user):
+    """Check if user and target user have liked each other"""
+    if not user.is_authenticated:
+        return False
+    state = _relationship_state(user, target_user)
+    if state is not None:
+        return state['matched']
+    return (
+        Like.objects.filter(liker=user, liked_user=target_user).exists()
+        and Like.objects.filter(liker=target_user, liked_user=user).exists()
+    )
+
+# The image filters take a related manager (profile.images) or any iterable
+# of ProfileImage and filter in Python, so they reuse prefetched rows
+# instead of issuing one query per call.
+def _image_list(images):
+    return images.all() if hasattr(images, 'all') else images
+
 @register.filter
 def primary_image(images):
-    return images.filter(is_primary=True).first()
+    return next((img for img in _image_list(images) if img.is_primary), None)
 
 @register.filter
 def public_images(images):
-    return images.filter(is_private=False, is_primary=False)
+    return [img for img in _image_list(images) if not img.is_private and not img.is_primary]
 
 @register.filter
 def private_images(images):
-    return images.filter(is_private=True)
+    return [img for img in _image_list(images) if img.is_private]
+
+@register.filter
+def media_url(path):
+    """URL of a stored file path, e.g. an annotated ``primary_image_path``."""
+    return default_storage.url(path) if path else ''
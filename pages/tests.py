@@ -1,3 +1,230 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.utils import timezone
+
+from .archive import archive_thread, message_page
+from .jobs import JOB_MAX_ATTEMPTS, JOB_STALE_AFTER, enqueue, run_pending, task
+from .messaging import send_message
+from .models import HotDate, Job, Message, MessageArchive, Thread
+from .pagination import decode_cursor, encode_cursor, paginate_by_cursor
+
+calls = []
+
+
+@task("tests.record")
+def record_task(payload):
+    calls.append(payload)
+
+
+@task("tests.fail")
+def fail_task(payload):
+    raise RuntimeError("boom")
+
+
+def ids(page):
+    return [obj.pk for obj in page]
+
+
+class CursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user("alice")
+        cls.bob = User.objects.create_user("bob")
+        thread = Thread.get_or_create_for(cls.alice, cls.bob)
+        cls.messages = [send_message(cls.alice, cls.bob, f"m{i}", thread) for i in range(7)]
+        # Several rows share a timestamp so the id tie-break matters
+        base = timezone.now()
+        for i, message in enumerate(cls.messages):
+            Message.objects.filter(pk=message.pk).update(created_at=base + timedelta(seconds=i // 2))
+        cls.queryset = Message.objects.filter(thread=thread)
+
+        start = timezone.now() + timedelta(days=1)
+        cls.hot_dates = [
+            HotDate.objects.create(
+                host=cls.alice, activity=f"a{i}", vibe="v", budget="b", duration="1h",
+                date_time=start + timedelta(hours=i // 2), area="x",
+            )
+            for i in range(5)
+        ]
+
+    def test_newest_first_walks_forward_and_back(self):
+        newest_first = [m.pk for m in reversed(self.messages)]
+        first = paginate_by_cursor(self.queryset, per_page=3)
+        self.assertEqual(ids(first), newest_first[:3])
+        self.assertFalse(first.has_previous)
+
+        second = paginate_by_cursor(self.queryset, after=first.next_cursor, per_page=3)
+        third = paginate_by_cursor(self.queryset, after=second.next_cursor, per_page=3)
+        self.assertEqual(ids(second), newest_first[3:6])
+        self.assertEqual(ids(third), newest_first[6:])
+        self.assertFalse(third.has_next)
+
+        back = paginate_by_cursor(self.queryset, before=second.previous_cursor, per_page=3)
+        self.assertEqual(ids(back), ids(first))
+        self.assertFalse(back.has_previous)
+        self.assertTrue(back.has_next)
+
+    def test_ascending(self):
+        queryset = HotDate.objects.all()
+        soonest_first = [h.pk for h in self.hot_dates]
+        first = paginate_by_cursor(queryset, per_page=2, field="date_time", descending=False)
+        second = paginate_by_cursor(queryset, after=first.next_cursor, per_page=2, field="date_time", descending=False)
+        self.assertEqual(ids(first), soonest_first[:2])
+        self.assertEqual(ids(second), soonest_first[2:4])
+
+        back = paginate_by_cursor(queryset, before=second.previous_cursor, per_page=2, field="date_time", descending=False)
+        self.assertEqual(ids(back), soonest_first[:2])
+
+    def test_garbled_cursor_falls_back_to_first_page(self):
+        self.assertIsNone(decode_cursor("not-a-cursor"))
+        page = paginate_by_cursor(self.queryset, after="not-a-cursor", per_page=3)
+        self.assertEqual(ids(page), ids(paginate_by_cursor(self.queryset, per_page=3)))
+
+    def test_cursor_round_trip(self):
+        stamp = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor(stamp, 42)), (stamp, 42))
+
+
+class ThreadCursorTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user("alice")
+        self.bob = User.objects.create_user("bob")
+        self.thread = Thread.get_or_create_for(self.alice, self.bob)
+
+    def send(self, text="hi"):
+        return send_message(self.bob, self.alice, text, self.thread)
+
+    def reload(self):
+        return Thread.objects.get(pk=self.thread.pk)
+
+    def test_mark_read_leaves_later_messages_unread(self):
+        self.send()
+        self.send()
+        loaded = self.reload()
+        late = self.send()  # arrives after the thread was loaded
+
+        self.assertEqual(loaded.mark_read_for(self.alice), 2)
+        thread = self.reload()
+        self.assertEqual(thread.unread_count_for(self.alice), 1)
+        self.assertFalse(Message.objects.get(pk=late.pk).is_read)
+
+    def test_mark_read_up_to(self):
+        self.send()
+        loaded = self.reload()
+        late = self.send()
+
+        self.assertEqual(loaded.mark_read_for(self.alice, up_to=late.pk), 2)
+        self.assertEqual(self.reload().unread_count_for(self.alice), 0)
+        self.assertTrue(Message.objects.get(pk=late.pk).is_read)
+
+    def test_stale_instance_does_not_mark_twice(self):
+        self.send()
+        stale = self.reload()
+        self.reload().mark_read_for(self.alice)
+        self.assertEqual(stale.mark_read_for(self.alice), 0)
+
+    def test_mark_all_read_for(self):
+        carol = User.objects.create_user("carol")
+        self.send()
+        send_message(carol, self.alice, "hey")
+        send_message(carol, self.alice, "there")
+        threads = list(Thread.inbox_for(self.alice))
+        self.send()
+
+        self.assertEqual(Thread.mark_all_read_for(self.alice, threads), 3)
+        self.assertEqual(self.reload().unread_count_for(self.alice), 1)
+
+        # Another request marks the same threads first: the total is unknown
+        stale = list(Thread.inbox_for(self.alice))
+        Thread.mark_all_read_for(self.alice, list(Thread.inbox_for(self.alice)))
+        self.assertIsNone(Thread.mark_all_read_for(self.alice, stale))
+
+    def test_clear_for_hides_history_from_one_side(self):
+        self.send()
+        self.send()
+        loaded = self.reload()
+        late = self.send()
+
+        self.assertEqual(loaded.clear_for(self.alice), 2)
+        self.assertEqual(list(Message.objects.visible_to(self.alice).values_list("pk", flat=True)), [late.pk])
+        self.assertEqual(Message.objects.visible_to(self.bob).count(), 3)
+        self.assertEqual(self.reload().unread_count_for(self.alice), 1)
+
+
+class MessageArchiveTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user("alice")
+        self.bob = User.objects.create_user("bob")
+        self.thread = Thread.get_or_create_for(self.alice, self.bob)
+        self.messages = [send_message(self.alice, self.bob, f"m{i}", self.thread) for i in range(10)]
+        base = timezone.now() - timedelta(days=30)
+        for i, message in enumerate(self.messages):
+            Message.objects.filter(pk=message.pk).update(created_at=base + timedelta(minutes=i))
+        self.thread.refresh_from_db()
+
+    def test_pages_continue_from_hot_rows_into_archive(self):
+        cutoff = Message.objects.get(pk=self.messages[6].pk).created_at
+        self.assertEqual(archive_thread(self.thread, cutoff), 6)
+        self.assertEqual(Message.objects.filter(thread=self.thread).count(), 4)
+        self.assertTrue(MessageArchive.objects.filter(thread=self.thread).exists())
+
+        seen, after = [], None
+        while True:
+            page = message_page(self.thread, self.bob, after=after, per_page=3)
+            seen += [m.id for m in page]
+            if not page.has_next:
+                break
+            after = page.next_cursor
+        self.assertEqual(seen, [m.pk for m in reversed(self.messages)])
+
+    def test_archive_respects_clear_cursor(self):
+        archive_thread(self.thread, timezone.now())
+        self.thread.clear_for(self.bob)
+        self.assertEqual(len(message_page(self.thread, self.bob, per_page=30)), 0)
+        self.assertEqual(len(message_page(self.thread, self.alice, per_page=30)), 10)
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_successful_job_runs_once_and_is_deleted(self):
+        enqueue("tests.record", {"n": 1})
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(calls, [{"n": 1}])
+        self.assertFalse(Job.objects.exists())
+        self.assertEqual(run_pending(), 0)
+
+    def test_unknown_task_is_rejected(self):
+        with self.assertRaises(KeyError):
+            enqueue("tests.missing")
+
+    def test_delayed_job_waits(self):
+        enqueue("tests.record", delay=timedelta(minutes=5))
+        self.assertEqual(run_pending(), 0)
+
+    def test_failure_backs_off_then_fails(self):
+        job = enqueue("tests.fail")
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn("boom", job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(attempts=JOB_MAX_ATTEMPTS - 1, run_at=timezone.now())
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(run_pending(), 0)
+
+    def test_stale_running_job_is_reclaimed(self):
+        job = enqueue("tests.record", {"n": 2})
+        Job.objects.filter(pk=job.pk).update(status=Job.Status.RUNNING, started_at=timezone.now(), attempts=1)
+        self.assertEqual(run_pending(), 0)  # still owned by a live worker
 
-# Create your tests here.
+        Job.objects.filter(pk=job.pk).update(started_at=timezone.now() - JOB_STALE_AFTER - timedelta(seconds=1))
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(calls, [{"n": 2}])
@@ -7,6 +7,7 @@ urlpatterns = [
     # Core Pages
     path('', views.home, name='home'),
     path('dashboard/', views.dashboard, name='dashboard'),
+    path('dashboard/feed/', views.dashboard_feed, name='dashboard_feed'),
     
     # ======================
     # STATIC PAGES - CORRECTED TEMPLATE NAMES
@@ -40,14 +41,20 @@ urlpatterns = [
     path('unfavorite/<int:user_id>/', views.unfavorite_user, name='unfavorite_user'),
     path('likes/received/', views.likes_received, name='likes_received'),
     path('likes/given/', views.likes_given, name='likes_given'),
+    path('likes/received/feed/', views.likes_received_feed, name='likes_received_feed'),
+    path('likes/given/feed/', views.likes_given_feed, name='likes_given_feed'),
     path('matches/', views.matches_list, name='matches_list'),
     
     # Messaging
     path('messages/', views.messages_combined, name='messages_list'),
     path('messages/<int:user_id>/', views.message_thread, name='message_thread'),
+    path('messages/<int:user_id>/history/', views.message_history, name='message_history'),
+    path('messages/<int:user_id>/since/', views.messages_since, name='messages_since'),
     path('send-message/<int:user_id>/', views.send_quick_message, name='send_quick_message'),
     path('messages/delete-conversation/<int:thread_id>/', views.delete_conversation, name='delete_conversation'),
     path('messages/unread-count/', views.messages_unread_count, name='messages_unread_count'),        
+    path('badges/', views.badges, name='badges'),
+    path('badges/stream/', views.badge_stream, name='badge_stream'),
 
     # Hot Dates - ENHANCED WITH CANCELLATION
     path('hotdates/', views.hotdate_list, name='hotdate_list'),
@@ -91,6 +98,7 @@ urlpatterns = [
     path('api/upload-profile-image/', views.upload_profile_image_api, name='upload_profile_image_api'),
     path('api/delete-image/<int:image_id>/', views.delete_image_api, name='delete_image_api'),
     path('api/create-profile/', views.create_profile_api, name='create_profile_api'),
+    path('api/search/', views.search_api, name='search_api'),
 
     # NEW Admin URLs (only the ones that exist in views.py)
     path('admin/new-profiles/', views.admin_new_profile, name='admin_new_profiles'),  # This one exists now
@@ -1,25 +1,53 @@
 # pages/views.py
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, QueryDict, StreamingHttpResponse
+from django.contrib.auth import SESSION_KEY, get_user
 from django.contrib.auth.models import User
 from django.utils import timezone
-from datetime import timedelta, date, datetime
+from datetime import timedelta, datetime
+import asyncio
+import hashlib
 import json
-from django.db.models import Q
-from django.core.paginator import Paginator
+from asgiref.sync import sync_to_async
+from django.core.files.storage import default_storage
+from django.db.models import OuterRef, Q, Subquery
+from django.urls import reverse
 from django.contrib import messages
-import re
 from .models import ProfileImage
+from .pagination import CursorPage, paginate_by_cursor
+from .search import search_profile_ids
+from .forms import ProfileSearchForm
+from .badges import (
+    abadge_version, adjust_badge_counters, badge_counts, badge_version,
+    mark_hotdates_seen, new_hotdates_count, recount_badge_counters, unread_message_count
+)
+from .messaging import defer_message, send_message
+from .jobs import enqueue
+from .likes import set_like
+from .archive import message_page
 from django.views.decorators.csrf import csrf_exempt
-from django.db import transaction
+from django.db import connection, transaction
 
 # Import your models
 from .models import (
-    Profile, Message, Thread, Like, Block, PrivateAccessRequest, 
-    HotDate, HotDateView, HotDateNotification, Blog, UserActivity
+    Profile, Thread, Like, Match, Block, PrivateAccessRequest, 
+    HotDate, HotDateView, HotDateNotification, Blog, UserActivity,
+    annotate_relationships, block_state, hidden_user_ids, log_user_activity
 )
 
+# Badge stream (badge_stream view): stream length before the browser
+# reconnects, how often a held stream checks for changes, and the reconnect
+# delay used when we can't hold the stream open (WSGI).
+BADGE_STREAM_SECONDS = 55
+BADGE_STREAM_TICK = 1
+BADGE_STREAM_WSGI_RETRY_MS = 15000
+
+# Messages rendered when a thread opens; older ones load via message_history.
+MESSAGE_PAGE_SIZE = 30
+
+HOTDATE_PAGE_SIZE = 12
+
 # ======================
 # PREVIEW USE - START (NEW VIEWS)
 # ======================
@@ -112,14 +140,14 @@ def browse_preview(request):
         is_approved=True
     ).prefetch_related('images'
     ).exclude(
-        Q(user=request.user) |
-        Q(user__in=Block.objects.filter(blocker=request.user).values('blocked')) |
-        Q(user__in=Block.objects.filter(blocked=request.user).values('blocker'))
-    ).order_by('-created_at')
+        user_id__in=hidden_user_ids(request.user) | {request.user.id}
+    )
     
-    paginator = Paginator(profiles, 12)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    page_obj = paginate_by_cursor(
+        profiles,
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+    )
     
     context = {
         'is_approved_user': False,
@@ -140,6 +168,56 @@ def home(request):
         return redirect('dashboard')
     return render(request, 'pages/home.html')
 
+def _feed_base(request, user_profile):
+    """
+    Approved profiles the current user may see, before block/self exclusion,
+    plus a key naming that set (shared by every user with the same key).
+    """
+    # ========== ENHANCED GENDER MATCHING ALGORITHM ==========
+    if user_profile and user_profile.is_approved and not request.user.is_superuser:
+        # TWO-WAY MATCHING for regular users:
+        # 1. Their gender matches what I'm looking for
+        # 2. AND they are looking for my gender
+        # Served from the partial profile_feed_idx index (see Profile.Meta).
+        return Profile.compatible_with(user_profile), ('match', user_profile.my_gender, user_profile.looking_for)
+    # Superusers see ALL profiles, or fallback for unapproved users
+    return Profile.objects.filter(is_approved=True), ('all',)
+
+def _feed_queryset(request, user_profile):
+    """Approved profiles the current user may see in the discovery feed."""
+    suggested_profiles, _ = _feed_base(request, user_profile)
+    
+    # Exclude blocked users and self
+    return suggested_profiles.exclude(
+        user_id__in=hidden_user_ids(request.user) | {request.user.id}
+    )
+
+def _search_results(request, user_profile, filters):
+    """Best matches for ``filters``, id list cached across users per feed scope."""
+    queryset, scope = _feed_base(request, user_profile)
+    ids = search_profile_ids(queryset, filters, scope)
+    profiles = {
+        p.id: p for p in Profile.objects.filter(id__in=ids).exclude(
+            user_id__in=hidden_user_ids(request.user) | {request.user.id}
+        ).select_related('user').prefetch_related('images')
+    }
+    return [profiles[i] for i in ids if i in profiles]
+
+def _profile_card(profile):
+    """JSON-serialisable card for the infinite-scroll feeds."""
+    first_image = next(iter(profile.images.all()), None)
+    state = getattr(profile.user, 'relationship_state', {})
+    return {
+        'user_id': profile.user_id,
+        'username': profile.user.username,
+        'age': profile.age,
+        'headline': profile.headline,
+        'location': profile.location,
+        'image_url': first_image.image.url if first_image else None,
+        'liked': state.get('liked', False),
+        'is_match': state.get('matched', False),
+    }
+
 @login_required
 def dashboard(request):
     """Main dashboard with PROFILE MATCHING based on gender preferences"""
@@ -154,135 +232,90 @@ def dashboard(request):
     if not is_approved_user and not request.user.is_staff:
         return redirect('preview_gate')
     
-    # ========== ENHANCED GENDER MATCHING ALGORITHM ==========
-    def get_genders_user_wants(looking_for):
-        """Convert 'looking_for' to list of genders user wants to see"""
-        mapping = {
-            'male': ['male'],
-            'female': ['female'],
-            'bisexual': ['male', 'female'],
-            'unspecified': ['male', 'female', 'nonbinary']
-        }
-        return mapping.get(looking_for, ['male', 'female', 'nonbinary'])
-    
-    def who_wants_my_gender(my_gender):
-        """Convert my gender to what others would look for to see me"""
-        mapping = {
-            'male': ['male', 'bisexual', 'unspecified'],
-            'female': ['female', 'bisexual', 'unspecified'],
-            'nonbinary': ['unspecified'],
-            'unspecified': ['male', 'female', 'bisexual', 'unspecified']
-        }
-        return mapping.get(my_gender, ['unspecified'])
-    
-    # Start with base queryset
-    if user_profile and user_profile.is_approved and not request.user.is_superuser:
-        # TWO-WAY MATCHING for regular users: 
-        # 1. Their gender matches what I'm looking for
-        # 2. AND they are looking for my gender
-        suggested_profiles = Profile.objects.filter(
-            is_approved=True
-        ).filter(
-            # Their gender is what I want
-            my_gender__in=get_genders_user_wants(user_profile.looking_for),
-            # AND they want my gender
-            looking_for__in=who_wants_my_gender(user_profile.my_gender)
-        )
-    else:
-        # Superusers see ALL profiles, or fallback for unapproved users
-        suggested_profiles = Profile.objects.filter(is_approved=True)
-    
-    # Exclude blocked users and self
-    suggested_profiles = suggested_profiles.exclude(
-        Q(user=request.user) |
-        Q(user__in=Block.objects.filter(blocker=request.user).values('blocked')) |
-        Q(user__in=Block.objects.filter(blocked=request.user).values('blocker'))
-    ).prefetch_related('images').order_by('-created_at')
-    # ========== END MATCHING ALGORITHM ==========
-    
-    # Check if we have a search query from session
-    search_query = request.session.pop('search_query', None)
-    search_performed = request.session.pop('search_performed', False)
-    
-    if search_query and search_performed:
-        # Apply search filtering (your existing search logic)
-        age_range_match = re.match(r'(\d+)-(\d+)', search_query)
-        if age_range_match:
-            min_age = int(age_range_match.group(1))
-            max_age = int(age_range_match.group(2))
-            
-            if min_age > max_age:
-                min_age, max_age = max_age, min_age
-            
-            today = date.today()
-            max_birth_date = today.replace(year=today.year - min_age)
-            min_birth_date = today.replace(year=today.year - max_age - 1)
-            
-            suggested_profiles = suggested_profiles.filter(
-                date_of_birth__gte=min_birth_date,
-                date_of_birth__lte=max_birth_date
-            )
-        
-        elif search_query.isdigit():
-            age = int(search_query)
-            today = date.today()
-            min_birth_date = today.replace(year=today.year - age - 1)
-            max_birth_date = today.replace(year=today.year - age)
-            
-            suggested_profiles = suggested_profiles.filter(
-                date_of_birth__gte=min_birth_date,
-                date_of_birth__lte=max_birth_date
-            )
-        
-        else:
-            search_conditions = Q()
-            search_terms = search_query.split()
-            
-            for term in search_terms:
-                term_condition = Q()
-                term_condition |= Q(user__username__icontains=term)
-                term_condition |= Q(user__first_name__icontains=term)
-                term_condition |= Q(user__last_name__icontains=term)
-                term_condition |= Q(headline__icontains=term)
-                term_condition |= Q(about__icontains=term)
-                term_condition |= Q(location__icontains=term)
-                term_condition |= Q(my_interests__icontains=term)
-                term_condition |= Q(must_have_tags__icontains=term)
-                term_condition |= Q(pets__icontains=term)
-                term_condition |= Q(diet__icontains=term)
-                
-                search_conditions &= term_condition
-            
-            suggested_profiles = suggested_profiles.filter(search_conditions)
+    suggested_profiles = _feed_queryset(request, user_profile).select_related('user').prefetch_related('images')
     
-    # Order and paginate
-    suggested_profiles = suggested_profiles.order_by('-created_at')
-    paginator = Paginator(suggested_profiles, 12)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination on (created_at, id) - no COUNT(*), no OFFSET
+    page_obj = paginate_by_cursor(
+        suggested_profiles,
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+    )
     
     context = {
         'profile': user_profile,
         'suggested_profiles': page_obj,
-        'search_query': search_query,
-        'search_performed': search_performed,
+        'search_query': None,
+        'search_performed': False,
         'is_approved_user': is_approved_user,
     }
     return render(request, 'pages/gr8date_dashboard_fixed_v10_nolines.html', context)
 
+@login_required
+def dashboard_feed(request):
+    """Infinite-scroll JSON for the dashboard grid: ?after=<cursor>"""
+    try:
+        user_profile = Profile.objects.get(user=request.user)
+    except Profile.DoesNotExist:
+        user_profile = None
+    
+    if not (user_profile and user_profile.is_approved) and not request.user.is_staff:
+        return JsonResponse({'success': False, 'error': 'Profile not approved'}, status=403)
+    
+    page_obj = paginate_by_cursor(
+        _feed_queryset(request, user_profile).select_related('user').prefetch_related('images'),
+        after=request.GET.get('after'),
+    )
+    annotate_relationships(request.user, [p.user for p in page_obj])
+    return JsonResponse({
+        'success': True,
+        'profiles': [_profile_card(p) for p in page_obj],
+        'next_cursor': page_obj.next_cursor,
+    })
+
 @login_required
 def search(request):
-    """Enhanced search - redirect to dashboard with filtered results"""
-    query = request.GET.get('q', '').strip()
+    """Profile search with typed filters, rendered straight into the dashboard"""
+    user_profile = Profile.objects.filter(user=request.user).first()
+    if not (user_profile and user_profile.is_approved) and not request.user.is_staff:
+        return redirect('preview_gate')
     
-    if not query:
+    form = ProfileSearchForm(request.GET)
+    if not form.is_valid():
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(request, error)
+        return redirect('dashboard')
+    if not form.filters:
         return redirect('dashboard')
     
-    # Store search query in session for dashboard to use
-    request.session['search_query'] = query
-    request.session['search_performed'] = True
-    
-    return redirect('dashboard')
+    context = {
+        'profile': user_profile,
+        'suggested_profiles': CursorPage(_search_results(request, user_profile, form.filters)),
+        'search_query': form.summary(),
+        'search_performed': True,
+        'search_form': form,
+        'is_approved_user': bool(user_profile and user_profile.is_approved),
+    }
+    return render(request, 'pages/gr8date_dashboard_fixed_v10_nolines.html', context)
+
+@login_required
+def search_api(request):
+    """JSON profile search: same filters as /search/"""
+    user_profile = Profile.objects.filter(user=request.user).first()
+    if not (user_profile and user_profile.is_approved) and not request.user.is_staff:
+        return JsonResponse({'success': False, 'error': 'Profile not approved'}, status=403)
+    
+    form = ProfileSearchForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'success': False, 'errors': form.errors}, status=400)
+    
+    results = _search_results(request, user_profile, form.filters)
+    annotate_relationships(request.user, [p.user for p in results])
+    return JsonResponse({
+        'success': True,
+        'filters': form.filters,
+        'profiles': [_profile_card(p) for p in results],
+    })
 
 # Profile Management
 @login_required
@@ -373,9 +406,10 @@ def profile_detail(request, user_id):
             elif access_request.status == 'pending':
                 has_pending_request = True
     
-    # Get images
-    public_images = profile.images.filter(is_private=False)
-    private_images = profile.images.filter(is_private=True)
+    # Get images (from the prefetch above - no extra queries)
+    images = profile.images.all()
+    public_images = [img for img in images if not img.is_private]
+    private_images = [img for img in images if img.is_private]
     
     # Check likes and blocks
     is_liked = Like.objects.filter(
@@ -383,30 +417,16 @@ def profile_detail(request, user_id):
         liked_user=profile.user
     ).exists()
     
-    is_blocked = Block.objects.filter(
-        blocker=request.user,
-        blocked=profile.user
-    ).exists()
-    
-    # Get next/previous profiles for navigation
-    all_profiles = Profile.objects.filter(
-        is_approved=True
-    ).exclude(user=request.user).prefetch_related('images')
-    
-    current_index = None
-    for idx, p in enumerate(all_profiles):
-        if p.user_id == profile.user_id:
-            current_index = idx
-            break
+    is_blocked = profile.user_id in block_state(request.user)['blocked']
     
-    previous_profile_id = None
-    next_profile_id = None
-    
-    if current_index is not None:
-        if current_index > 0:
-            previous_profile_id = all_profiles[current_index - 1].user_id
-        if current_index < len(all_profiles) - 1:
-            next_profile_id = all_profiles[current_index + 1].user_id
+    # Get next/previous profiles for navigation: the neighbours of this
+    # profile in the dashboard feed order (-created_at, -id), one LIMIT 1
+    # keyset query each.
+    feed = _feed_queryset(request, Profile.objects.filter(user=request.user).first())
+    newer = Q(created_at__gt=profile.created_at) | Q(created_at=profile.created_at, id__gt=profile.id)
+    older = Q(created_at__lt=profile.created_at) | Q(created_at=profile.created_at, id__lt=profile.id)
+    previous_profile_id = feed.filter(newer).order_by('created_at', 'id').values_list('user_id', flat=True).first()
+    next_profile_id = feed.filter(older).order_by('-created_at', '-id').values_list('user_id', flat=True).first()
     
     context = {
         'profile': profile,
@@ -486,45 +506,50 @@ def delete_image(request, image_id):
         return JsonResponse({'success': False}, status=404)
 
 # Likes & Matching
+def _requested_like_state(request):
+    """``like`` from a PUT body (JSON or form) or POST; None when absent."""
+    if request.method == 'PUT':
+        if request.content_type == 'application/json':
+            try:
+                data = json.loads(request.body or b'{}')
+            except ValueError:
+                data = {}
+        else:
+            data = QueryDict(request.body)
+    else:
+        data = request.POST
+    value = data.get('like')
+    if value is None:
+        return None
+    return value in (True, 1, '1', 'true', 'True', 'on')
+
 @login_required
 def like_user(request, user_id):
-    """Like or unlike a user"""
-    if request.method == 'POST':
+    """
+    Set or toggle a like.
+
+    PUT (or POST) with ``like=true|false`` sets the state and is safe to
+    retry; a bare POST keeps the old toggle behaviour.
+    """
+    if request.method in ('POST', 'PUT'):
         target_user = get_object_or_404(User, id=user_id)
         
         # Don't allow liking yourself
         if request.user == target_user:
             return JsonResponse({'status': 'error', 'message': 'Cannot like yourself'})
         
-        like, created = Like.objects.get_or_create(
-            liker=request.user,
-            liked_user=target_user
-        )
-        
-        if not created:
-            like.delete()
-            return JsonResponse({'status': 'success', 'action': 'unliked'})
+        like = _requested_like_state(request)
+        if like is None:
+            if request.method == 'PUT':
+                return JsonResponse({'status': 'error', 'message': 'Missing like'}, status=400)
+            like = not Like.objects.filter(liker=request.user, liked_user=target_user).exists()
         
-        # Check if it's a match (target user also liked current user)
-        is_match = Like.objects.filter(
-            liker=target_user,
-            liked_user=request.user
-        ).exists()
-        
-        # Create match message if it's a match
-        if is_match:
-            match_message = f"🎉 It's a match! You and {target_user.username} have liked each other."
-            thread = Thread.get_or_create_for(request.user, target_user)
-            Message.objects.create(
-                thread=thread,
-                sender=request.user,
-                recipient=target_user,
-                text=match_message
-            )
+        changed, is_match = set_like(request.user, target_user, like)
         
         return JsonResponse({
             'status': 'success', 
-            'action': 'liked',
+            'action': 'liked' if like else 'unliked',
+            'changed': changed,
             'is_match': is_match
         })
     
@@ -535,64 +560,122 @@ def unfavorite_user(request, user_id):
     """Unfavorite a user (alias for unlike)"""
     if request.method == 'POST':
         target_user = get_object_or_404(User, id=user_id)
-        
-        Like.objects.filter(
-            liker=request.user,
-            liked_user=target_user
-        ).delete()
-        
-        return JsonResponse({'status': 'success', 'action': 'unliked'})
+        changed, _ = set_like(request.user, target_user, False)
+        return JsonResponse({'status': 'success', 'action': 'unliked', 'changed': changed})
     
     return JsonResponse({'status': 'error'}, status=400)
 
+def _slim_likes(likes, person):
+    """
+    Project ``likes`` down to what a like card shows about ``person``
+    ('liker' or 'liked_user'): username, age, location, headline and the
+    primary image path - no full User/Profile rows, no image prefetch.
+    """
+    return likes.select_related(person, f'{person}__profile').only(
+        'created_at',
+        f'{person}__username',
+        f'{person}__profile__user_id',
+        f'{person}__profile__date_of_birth',
+        f'{person}__profile__location',
+        f'{person}__profile__headline',
+    ).annotate(
+        primary_image_path=Subquery(
+            ProfileImage.objects.filter(
+                profile__user=OuterRef(person), is_primary=True
+            ).values('image')[:1]
+        )
+    )
+
+def _like_card(like, person):
+    """JSON-serialisable card for the likes pages' infinite scroll."""
+    user = getattr(like, person)
+    profile = getattr(user, 'profile', None)
+    return {
+        'user_id': user.id,
+        'username': user.username,
+        'age': profile.age if profile else None,
+        'location': profile.location if profile else '',
+        'headline': profile.headline if profile else '',
+        'image_url': default_storage.url(like.primary_image_path) if like.primary_image_path else None,
+        'liked_at': like.created_at.isoformat(),
+    }
+
+def _likes_page(request, likes, person):
+    return paginate_by_cursor(
+        _slim_likes(likes, person),
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+    )
+
 @login_required
 def likes_received(request):
     """View likes received by current user"""
-    likes = Like.objects.filter(
-        liked_user=request.user
-    ).select_related('liker', 'liker__profile').prefetch_related('liker__profile__images')
-    
-    context = {'likes': likes}
-    return render(request, 'pages/likes_received.html', context)
+    page_obj = _likes_page(request, Like.objects.filter(liked_user=request.user), 'liker')
+    context = {
+        'likes': page_obj,
+        'person': 'liker',
+        'feed_url': reverse('likes_received_feed'),
+    }
+    return render(request, 'pages/likes_list.html', context)
 
 @login_required
 def likes_given(request):
     """View likes given by current user"""
-    likes = Like.objects.filter(
-        liker=request.user
-    ).select_related('liked_user', 'liked_user__profile').prefetch_related('liked_user__profile__images')
-    
-    context = {'likes': likes}
-    return render(request, 'pages/likes_given.html', context)
+    page_obj = _likes_page(request, Like.objects.filter(liker=request.user), 'liked_user')
+    context = {
+        'likes': page_obj,
+        'person': 'liked_user',
+        'feed_url': reverse('likes_given_feed'),
+    }
+    return render(request, 'pages/likes_list.html', context)
+
+@login_required
+def likes_received_feed(request):
+    """Infinite-scroll JSON for likes received: ?after=<cursor>"""
+    page_obj = _likes_page(request, Like.objects.filter(liked_user=request.user), 'liker')
+    return JsonResponse({
+        'success': True,
+        'likes': [_like_card(like, 'liker') for like in page_obj],
+        'next_cursor': page_obj.next_cursor,
+    })
+
+@login_required
+def likes_given_feed(request):
+    """Infinite-scroll JSON for likes given: ?after=<cursor>"""
+    page_obj = _likes_page(request, Like.objects.filter(liker=request.user), 'liked_user')
+    return JsonResponse({
+        'success': True,
+        'likes': [_like_card(like, 'liked_user') for like in page_obj],
+        'next_cursor': page_obj.next_cursor,
+    })
 
 @login_required
 def matches_list(request):
     """View matches (mutual likes)"""
-    # Get all likes given by current user
-    likes_given = Like.objects.filter(
-        liker=request.user
-    ).select_related('liked_user', 'liked_user__profile').prefetch_related('liked_user__profile__images')
-    
-    # Get all likes received by current user  
-    likes_received = Like.objects.filter(
-        liked_user=request.user
-    ).select_related('liker', 'liker__profile').prefetch_related('liker__profile__images')
+    # First page of likes each way; the likes pages carry the rest
+    likes_given = _likes_page(request, Like.objects.filter(liker=request.user), 'liked_user')
+    likes_received = _likes_page(request, Like.objects.filter(liked_user=request.user), 'liker')
     
     # Get all blocked users
     blocked_users = Block.objects.filter(
         blocker=request.user
     ).select_related('blocked', 'blocked__profile')
     
-    # Calculate mutual matches
-    given_user_ids = set(like.liked_user_id for like in likes_given)
-    received_user_ids = set(like.liker_id for like in likes_received)
-    match_user_ids = given_user_ids & received_user_ids
+    # Mutual matches, newest first, straight from the Match table
+    matches = Match.for_user(request.user).select_related(
+        'user_a', 'user_a__profile', 'user_b', 'user_b__profile'
+    ).order_by('-created_at')
+    match_list = [
+        {'user': match.get_other_user(request.user), 'created_at': match.created_at}
+        for match in matches
+    ]
     
     context = {
         'likes_given': likes_given,
         'likes_received': likes_received, 
         'blocked_users': blocked_users,
-        'match_user_ids': match_user_ids,
+        'matches': match_list,
+        'match_user_ids': {m['user'].id for m in match_list},
     }
     return render(request, 'pages/matches_list.html', context)
 
@@ -600,33 +683,25 @@ def matches_list(request):
 @login_required
 def messages_combined(request):
     """Combined messages view with threads and pending requests"""
-    threads = Thread.objects.filter(
-        Q(user_a=request.user) | Q(user_b=request.user)
-    ).prefetch_related('messages').order_by('-updated_at')
+    threads = Thread.inbox_for(request.user).select_related('user_a', 'user_b').order_by('-updated_at')
 
-    # Create thread data with other_user information
+    # Create thread data from the summary columns - no message queries
     thread_data = []
     for thread in threads:
-        other_user = thread.get_other_user(request.user)
-        unread_count = thread.messages.filter(
-            recipient=request.user,
-            is_read=False
-        ).count()
-        
         thread_data.append({
             'thread': thread,
-            'other_user': other_user,
-            'unread_count': unread_count,
-            'last_message': thread.last_message,
+            'other_user': thread.get_other_user(request.user),
+            'unread_count': thread.unread_count_for(request.user),
+            'last_message_text': thread.last_message_text,
             'updated_at': thread.updated_at
         })
 
     # Mark threads as read when user views them
-    for thread in threads:
-        thread.messages.filter(
-            recipient=request.user,
-            is_read=False
-        ).update(is_read=True)
+    marked_read = Thread.mark_all_read_for(request.user, threads)
+    if marked_read is None:
+        recount_badge_counters(request.user.id)
+    else:
+        adjust_badge_counters(request.user.id, unread_messages=-marked_read)
 
     # Get access requests for the current user
     pending_requests_received = PrivateAccessRequest.objects.filter(
@@ -640,6 +715,14 @@ def messages_combined(request):
     }
     return render(request, 'pages/messages_combined.html', context)
 
+def _message_data(message):
+    return {
+        'message_id': message.id,
+        'text': message.text,
+        'created_at': message.created_at.strftime('%b %d, %Y %H:%M'),
+        'sender_id': message.sender_id
+    }
+
 @login_required
 def message_thread(request, user_id):
     """View and send messages in a thread"""
@@ -656,25 +739,11 @@ def message_thread(request, user_id):
     if request.method == 'POST':
         text = request.POST.get('text', '').strip()
         if text:
-            message = Message.objects.create(
-                thread=thread,
-                sender=request.user,
-                recipient=other_user,
-                text=text
-            )
-            
-            # Update thread timestamp
-            thread.save()
+            message = send_message(request.user, other_user, text, thread=thread)
             
             # Return message data for AJAX handling
             if request.headers.get('x-requested-with') == 'XMLHttpRequest':
-                return JsonResponse({
-                    'success': True,
-                    'message_id': message.id,
-                    'text': message.text,
-                    'created_at': message.created_at.strftime('%b %d, %Y %H:%M'),
-                    'sender_id': message.sender_id
-                })
+                return JsonResponse({'success': True, **_message_data(message)})
             else:
                 return redirect('message_thread', user_id=user_id)
         
@@ -684,19 +753,75 @@ def message_thread(request, user_id):
         else:
             return redirect('message_thread', user_id=user_id)
     
-    # GET request - show the thread
-    messages_list = thread.messages.all().order_by('created_at')
+    # GET request - show the newest page of the thread, oldest first
+    page_obj = message_page(thread, request.user, per_page=MESSAGE_PAGE_SIZE)
+    messages_list = page_obj.object_list[::-1]
     
     # Mark messages as read when viewing thread
-    thread.messages.filter(recipient=request.user, is_read=False).update(is_read=True)
+    marked_read = thread.mark_read_for(request.user)
+    adjust_badge_counters(request.user.id, unread_messages=-marked_read)
     
     context = {
         'thread': thread,
         'other_user': other_user,
         'messages': messages_list,
+        'older_cursor': page_obj.next_cursor,
     }
     return render(request, 'pages/message_thread.html', context)
 
+@login_required
+def message_history(request, user_id):
+    """Older messages of a thread, oldest first: ?after=<cursor>"""
+    a_id, b_id = Thread.canonical_pair(request.user.id, user_id)
+    thread = Thread.objects.filter(user_a_id=a_id, user_b_id=b_id).first()
+    if thread is None:
+        return JsonResponse({'success': True, 'messages': [], 'next_cursor': None})
+    
+    page_obj = message_page(thread, request.user, after=request.GET.get('after'), per_page=MESSAGE_PAGE_SIZE)
+    return JsonResponse({
+        'success': True,
+        'messages': [_message_data(m) for m in page_obj.object_list[::-1]],
+        'next_cursor': page_obj.next_cursor,
+    })
+
+@login_required
+def messages_since(request, user_id):
+    """
+    Delta for an open conversation: messages newer than ?after_id=<id>,
+    oldest first, plus ``read_up_to`` - the newest of my messages the other
+    side has read. Incoming messages returned here count as read.
+    """
+    try:
+        after_id = int(request.GET.get('after_id', 0))
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid after_id'}, status=400)
+    
+    a_id, b_id = Thread.canonical_pair(request.user.id, user_id)
+    thread = Thread.objects.filter(user_a_id=a_id, user_b_id=b_id).first()
+    if thread is None:
+        return JsonResponse({'success': True, 'messages': [], 'read_up_to': None, 'has_more': False})
+    
+    new_messages = list(
+        thread.messages.visible_to(request.user).filter(id__gt=after_id).order_by('created_at', 'id')[:MESSAGE_PAGE_SIZE + 1]
+    )
+    has_more = len(new_messages) > MESSAGE_PAGE_SIZE
+    new_messages = new_messages[:MESSAGE_PAGE_SIZE]
+    
+    # Up to what was actually returned - the thread row may predate it
+    incoming = [m.id for m in new_messages if m.recipient_id == request.user.id]
+    if incoming:
+        marked_read = thread.mark_read_for(request.user, up_to=max(incoming))
+        adjust_badge_counters(request.user.id, unread_messages=-marked_read)
+    
+    read_up_to = thread.read_cursor_for(int(user_id)) or None
+    
+    return JsonResponse({
+        'success': True,
+        'messages': [_message_data(m) for m in new_messages],
+        'read_up_to': read_up_to,
+        'has_more': has_more,
+    })
+
 @login_required
 @csrf_exempt
 def send_quick_message(request, user_id):
@@ -712,39 +837,25 @@ def send_quick_message(request, user_id):
         if request.user == other_user:
             return JsonResponse({'success': False, 'error': 'Cannot message yourself'})
         
-        thread = Thread.get_or_create_for(request.user, other_user)
-        message = Message.objects.create(
-            thread=thread,
-            sender=request.user,
-            recipient=other_user,
-            text=text
-        )
-        
-        # Update thread timestamp
-        thread.save()
+        message = send_message(request.user, other_user, text)
         
-        return JsonResponse({
-            'success': True,
-            'message_id': message.id,
-            'text': message.text,
-            'created_at': message.created_at.strftime('%b %d, %Y %H:%M'),
-            'sender_id': message.sender_id
-        })
+        return JsonResponse({'success': True, **_message_data(message)})
     
     return JsonResponse({'success': False, 'error': 'Invalid request method'})
 
 @login_required
 def delete_conversation(request, thread_id):
-    """Delete all messages in a conversation"""
+    """Delete a conversation from the current user's view"""
     if request.method == 'POST':
         thread = get_object_or_404(Thread, id=thread_id)
         
         # Verify user is part of the thread
-        if request.user not in [thread.user_a, thread.user_b]:
+        if request.user.id not in (thread.user_a_id, thread.user_b_id):
             return JsonResponse({'ok': False, 'error': 'Not authorized'})
         
-        # Delete all messages in the thread
-        thread.messages.all().delete()
+        # Hide everything so far from this user only; nothing is deleted
+        discarded = thread.clear_for(request.user)
+        adjust_badge_counters(request.user.id, unread_messages=-discarded)
         
         return JsonResponse({'ok': True})
     
@@ -754,16 +865,91 @@ def delete_conversation(request, thread_id):
 def messages_unread_count(request):
     """Return count of unread messages for the current user"""
     try:
-        count = Message.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).count()
-        
-        return JsonResponse({'count': count})
+        return JsonResponse({'count': unread_message_count(request.user)})
     except Exception as e:
         print(f"DEBUG: Error in messages_unread_count: {e}")
         return JsonResponse({'count': 0})
 
+def badges(request):
+    """
+    Both header badge counts in one response, with an ETag built from the
+    cached badge version. A poll with a current If-None-Match is answered
+    304 from the session and cache alone - no user, counter or COUNT queries.
+    """
+    user_id = request.session.get(SESSION_KEY)
+    if user_id is None:
+        return JsonResponse({'error': 'Not authenticated'}, status=401)
+    
+    etag = '"%s"' % hashlib.md5(repr((user_id, badge_version(user_id))).encode()).hexdigest()
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    else:
+        if not request.user.is_authenticated:
+            return JsonResponse({'error': 'Not authenticated'}, status=401)
+        response = JsonResponse(badge_counts(request.user))
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+async def badge_stream(request):
+    """
+    Server-sent events carrying the header badge counts.
+
+    Under ASGI the stream stays open and only recounts when a badge version
+    changes (see pages/badges.py), so an idle tab costs one cache read per
+    BADGE_STREAM_TICK and no SQL. Under WSGI a held stream would pin a
+    worker thread, so it sends the current counts once and asks the browser
+    to reconnect after BADGE_STREAM_WSGI_RETRY_MS.
+    """
+    user = await sync_to_async(get_user)(request)
+    if not user.is_authenticated:
+        return HttpResponse(status=401)
+    
+    def event(counts):
+        return f"event: badges\ndata: {json.dumps(counts)}\n\n"
+    
+    if 'wsgi.version' in request.META:
+        counts = await sync_to_async(badge_counts)(user)
+        return HttpResponse(
+            f"retry: {BADGE_STREAM_WSGI_RETRY_MS}\n" + event(counts),
+            content_type='text/event-stream',
+            headers={'Cache-Control': 'no-cache'},
+        )
+    
+    def recount():
+        # Don't hold a database connection for the life of the stream
+        try:
+            return badge_counts(user)
+        finally:
+            connection.close()
+    
+    async def events():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + BADGE_STREAM_SECONDS
+        last_version = last_counts = None
+        idle_ticks = 0
+        while loop.time() < deadline:
+            version = await abadge_version(user.pk)
+            if version != last_version:
+                last_version = version
+                counts = await sync_to_async(recount)()
+                if counts != last_counts:
+                    last_counts = counts
+                    idle_ticks = 0
+                    yield event(counts)
+            idle_ticks += 1
+            if idle_ticks * BADGE_STREAM_TICK >= 15:
+                idle_ticks = 0
+                yield ": keepalive\n\n"
+            await asyncio.sleep(BADGE_STREAM_TICK)
+    
+    # The browser's EventSource reconnects by itself when the stream ends.
+    return StreamingHttpResponse(
+        events(),
+        content_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
 # Private Photo Access Views
 @login_required
 def request_private_access(request, user_id):
@@ -800,12 +986,7 @@ def request_private_access(request, user_id):
         
         # Send notification message to target user
         message_text = f"🔒 {request.user.username} requested access to your private photos. Go to your pending requests to approve or deny."
-        Message.objects.create(
-            thread=Thread.get_or_create_for(request.user, target_user),
-            sender=request.user,
-            recipient=target_user,
-            text=message_text
-        )
+        defer_message(request.user, target_user, message_text)
         
         return JsonResponse({'status': 'request_sent', 'message': 'Access request sent!'})
     
@@ -828,12 +1009,7 @@ def approve_private_access(request, request_id):
         
         # Send approval message with 72-hour notice
         approval_message = f"✅ {request.user.username} approved your private photo access request! You can now view their private photos for 72 hours."
-        Message.objects.create(
-            thread=Thread.get_or_create_for(request.user, access_request.requester),
-            sender=request.user,
-            recipient=access_request.requester,
-            text=approval_message
-        )
+        defer_message(request.user, access_request.requester, approval_message)
         
         if request.headers.get('x-requested-with') == 'XMLHttpRequest':
             return JsonResponse({'status': 'approved', 'message': 'Access granted for 72 hours!'})
@@ -859,12 +1035,7 @@ def deny_private_access(request, request_id):
         
         # Send denial message
         denial_message = f"❌ {request.user.username} denied your private photo access request."
-        Message.objects.create(
-            thread=Thread.get_or_create_for(request.user, access_request.requester),
-            sender=request.user,
-            recipient=access_request.requester,
-            text=denial_message
-        )
+        defer_message(request.user, access_request.requester, denial_message)
         
         if request.headers.get('x-requested-with') == 'XMLHttpRequest':
             return JsonResponse({'status': 'denied', 'message': 'Access denied'})
@@ -1040,29 +1211,8 @@ def unblock_user(request, user_id):
 def hotdates_new_count(request):
     """Count new Hot Dates AND cancellation notifications for the current user"""
     try:
-        # Get Hot Dates created in the last 24 hours that the user hasn't viewed
-        cutoff_time = timezone.now() - timedelta(hours=24)
-        
-        # Get Hot Dates created recently that user hasn't viewed
-        new_hotdates_count = HotDate.objects.filter(
-            created_at__gte=cutoff_time,
-            is_active=True,
-            is_cancelled=False
-        ).exclude(
-            views__user=request.user
-        ).count()
-        
-        # Get unread cancellation notifications
-        cancellation_notifications_count = HotDateNotification.objects.filter(
-            user=request.user,
-            is_read=False,
-            notification_type='cancelled'
-        ).count()
-        
-        total_count = new_hotdates_count + cancellation_notifications_count
-        
         return JsonResponse({
-            'count': total_count,
+            'count': new_hotdates_count(request.user),
             'preview': getattr(request, 'preview_mode', False)
         })
         
@@ -1076,25 +1226,36 @@ def hotdates_new_count(request):
 @login_required
 def hotdate_list(request):
     """Display list of Hot Dates with cancellation status"""
-    hot_dates = HotDate.objects.filter(
-        is_active=True,
-        date_time__gte=timezone.now()
-    ).order_by('date_time')
-    
-    # Get which Hot Dates the user has already viewed
-    viewed_hotdates = HotDateView.objects.filter(
-        user=request.user
-    ).values_list('hot_date_id', flat=True)
+    gender = Profile.objects.filter(user=request.user).values_list('my_gender', flat=True).first()
+    hot_dates = HotDate.objects.upcoming().visible_to(request.user, gender).with_seen(request.user).select_related('host')
+
+    group_size = request.GET.get('group_size', '')
+    if group_size in HotDate.GroupSize.values:
+        hot_dates = hot_dates.filter(group_size=group_size)
+    else:
+        group_size = ''
+
+    page_obj = paginate_by_cursor(
+        hot_dates,
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+        per_page=HOTDATE_PAGE_SIZE,
+        field='date_time',
+        descending=False,
+    )
     
     # Mark cancellation notifications as read when user views the list
-    HotDateNotification.objects.filter(
+    marked_read = HotDateNotification.objects.filter(
         user=request.user,
         is_read=False
     ).update(is_read=True)
+    adjust_badge_counters(request.user.id, unread_hotdate_notifications=-marked_read)
+    mark_hotdates_seen(request.user)
     
     return render(request, 'pages/hotdate_list.html', {
-        'hot_dates': hot_dates,
-        'viewed_hotdates': viewed_hotdates
+        'hot_dates': page_obj,
+        'group_size': group_size,
+        'group_sizes': HotDate.GroupSize.choices,
     })
 
 @login_required
@@ -1182,20 +1343,17 @@ def hotdate_cancel(request, hotdate_id):
     try:
         hot_date = HotDate.objects.get(id=hotdate_id, host=request.user)
         
-        # Mark as cancelled
-        hot_date.is_cancelled = True
-        hot_date.cancelled_at = timezone.now()
-        hot_date.save()
-        
-        # Send cancellation notifications to users who viewed this Hot Date
-        viewers = HotDateView.objects.filter(hot_date=hot_date).exclude(user=request.user)
-        for view in viewers:
-            HotDateNotification.objects.create(
-                user=view.user,
-                hot_date=hot_date,
-                notification_type='cancelled',
-                message=f"Hot Date '{hot_date.activity}' has been cancelled by the host"
-            )
+        with transaction.atomic():
+            # Mark as cancelled
+            hot_date.is_cancelled = True
+            hot_date.save()
+            
+            # Notify users who viewed this Hot Date - fanned out by the job runner
+            enqueue('pages.notify_hotdate_viewers', {
+                'hot_date_id': hot_date.id,
+                'notification_type': 'cancelled',
+                'message': f"Hot Date '{hot_date.activity}' has been cancelled by the host",
+            })
         
         return JsonResponse({
             'success': True, 
@@ -1212,9 +1370,12 @@ def hotdate_notification_mark_read(request, notification_id):
     """Mark a Hot Date notification as read"""
     try:
         notification = HotDateNotification.objects.get(id=notification_id, user=request.user)
+        was_unread = not notification.is_read
         notification.is_read = True
         notification.read_at = timezone.now()
         notification.save()
+        if was_unread:
+            adjust_badge_counters(request.user.id, unread_hotdate_notifications=-1)
         return JsonResponse({'success': True})
     except HotDateNotification.DoesNotExist:
         return JsonResponse({'success': False, 'error': 'Notification not found'})
@@ -1223,11 +1384,9 @@ def hotdate_notification_mark_read(request, notification_id):
 @login_required
 def track_activity(request, activity_type):
     """Track user activity for analytics"""
-    if request.user.is_authenticated:
-        UserActivity.objects.create(
-            user=request.user,
-            activity_type=activity_type
-        )
+    if activity_type not in UserActivity.ActionType.values:
+        return JsonResponse({'status': 'error', 'message': 'Unknown activity'}, status=400)
+    log_user_activity(request.user, activity_type, request)
     return JsonResponse({'status': 'success'})
 
 # Profile Creation Views